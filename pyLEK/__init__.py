@@ -3,3 +3,10 @@ __version__ = "0.2.0"
 __all__ = [
     # add public symbols here, e.g. "solve", "Model"
 ]
+
+from pyLEK.helpers.lazy import lazyModule
+
+# Submodules are imported on first access, e.g. pyLEK.plotters
+_submodules = {"helpers", "plotters", "render"}
+
+__getattr__, __dir__ = lazyModule(__name__, _submodules)
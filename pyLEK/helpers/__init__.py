@@ -0,0 +1,7 @@
+from pyLEK.helpers.lazy import lazyModule
+
+# Submodules are imported on first access, e.g. pyLEK.helpers.filemanager
+_submodules = {"animation", "csvEditor", "deprecated", "filemanager", "generalMath", "importTime",
+               "kwargschecker", "lazy", "matlab", "pyExtras", "txtEditor"}
+
+__getattr__, __dir__ = lazyModule(__name__, _submodules)
@@ -8,7 +8,6 @@
 # Libraries
 # ------------------------------------------------------------------------------
 import os
-from pick import pick
 from pyLEK.helpers import filemanager
 # ------------------------------------------------------------------------------
 # Functions
@@ -79,6 +78,8 @@ def pngToGif(*, inFolder=None):
 
 
 if __name__ == "__main__":
+    from pick import pick
+
     # Opens user dialog to select functions from predefined list
     title = 'Please choose conversion option'
     options = ['pngToMp4', 'pngToGif']
@@ -7,7 +7,6 @@
 # ------------------------------------------------------------------------------
 # Libraries
 # ------------------------------------------------------------------------------
-import pandas as pd
 # ------------------------------------------------------------------------------
 # Functions
 # ------------------------------------------------------------------------------
@@ -19,6 +18,8 @@ def writeToCsv(fname, array, writeMode='a'):
     :param array: list/np.array w/ text content
     :param writeMode: str w/ how to open file ('a', 'w')
     """
+    import pandas as pd
+
     pd.DataFrame(array).to_csv(fname, mode=writeMode,
                                index=False, sep='\t', decimal=',')
 
@@ -29,6 +30,8 @@ def readFromCsv(fname, sep='\t', decimal='.'):
     :param sep: str w/ separator
     :param decimal: str w/ decimal separator
     """
+    import pandas as pd
+
     # Read csv file
     df = pd.read_csv(fname, sep=sep, decimal=decimal)
     return df
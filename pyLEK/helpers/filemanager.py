@@ -11,8 +11,6 @@ import os
 import sys
 import shutil
 from typing import NamedTuple
-import tkinter as tk
-from tkinter import filedialog
 from pyLEK.helpers.deprecated import *
 # ------------------------------------------------------------------------------
 # Functions
@@ -97,11 +95,36 @@ def scanSubdirsForFilesWithExtension(dirpath, extension):
     return filenames, filepaths
 
 
+def getCacheDir(subdir=None):
+    """Returns the cache directory of pyLEK and creates it if necessary,
+    can be changed by setting the environment variable PYLEK_CACHE_DIR
+    :param subdir: string w/ name of subfolder within the cache directory
+    :rtype dirpath: str w/ abspath to the cache directory
+    """
+    dirpath = os.environ.get('PYLEK_CACHE_DIR')
+    if not dirpath:
+        if os.name == 'nt':
+            base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        else:
+            base = os.environ.get('XDG_CACHE_HOME',
+                                  os.path.join(os.path.expanduser('~'), '.cache'))
+        dirpath = os.path.join(base, 'pyLEK')
+
+    if subdir:
+        dirpath = os.path.join(dirpath, subdir)
+
+    os.makedirs(dirpath, exist_ok=True)
+    return dirpath
+
+
 def folderDialog(title=None):
     """Opens dialog to choose a folder
     :param title: string with title of dialog
     :rtype dirpath: str w/ path to folder
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     dirpath = filedialog.askdirectory(title=title)
@@ -120,6 +143,9 @@ def openFileDialog(title=None, filetypes=[]):
     :param filetypes: list w/ filetypes. The general syntax is eg. filetypes=[("Excel files", "*.xlsx"), (label2, ext2), ...]
     :rtype filepath: str w/ path to file
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     filepath = filedialog.askopenfilename(title=title, filetypes=filetypes)
@@ -133,6 +159,9 @@ def saveFileDialog(title=None, filetypes=[]):
     :param filetypes: list w/ filetypes. The general syntax is eg. filetypes=[("Excel files", "*.xlsx"), (label2, ext2), ...]
     :rtype filepath: str w/ path to file
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     filepath = filedialog.asksaveasfilename(
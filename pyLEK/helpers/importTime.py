@@ -0,0 +1,102 @@
+# ------------------------------------------------------------------------------
+# Description:  Measuring the import time of modules
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Import functions / collections (from pyLEK.helpers import importTime)
+#               Executing from command line (python -m pyLEK.helpers.importTime)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import json
+import statistics
+import subprocess
+import sys
+# ------------------------------------------------------------------------------
+# Functions
+# ------------------------------------------------------------------------------
+
+# Dependencies which are only imported when a function needs them
+heavyModules = ["tkinter", "seaborn", "scipy", "pandas", "PyQt5", "imageio", "pick"]
+
+# Modules of pyLEK and the dependencies they may import {module: [allowed]}
+guardedModules = {
+    "pyLEK": [],
+    "pyLEK.helpers.filemanager": [],
+    "pyLEK.helpers.csvEditor": [],
+    "pyLEK.helpers.matlab": [],
+    "pyLEK.helpers.animation": [],
+    "pyLEK.plotters.plotStyle.mplStyle": [],
+    "pyLEK.plotters.plotHelpers": [],
+    "pyLEK.plotters.plot2D": [],
+    "pyLEK.plotters.plot3D_surf": [],
+    "pyLEK.plotters.plotPieChart": [],
+    "pyLEK.render": [],
+}
+
+_script = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measureImport(module, repeat=3):
+    """Imports a module in fresh interpreters
+    :param module: string w/ name of the module, e.g. 'pyLEK.plotters.plot2D'
+    :param repeat: int w/ number of interpreters, the median is returned
+    :rtype seconds: float w/ median import time
+    :rtype loaded: list w/ heavy modules imported along with the module
+    """
+    seconds, loaded = [], []
+    for i in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _script.format(module=module, heavy=heavyModules)],
+                             capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        seconds.append(result["seconds"])
+        loaded = result["loaded"]
+
+    return statistics.median(seconds), loaded
+
+
+def checkImports(modules=None, maxSeconds=None, repeat=3):
+    """Guards against import time regressions: raises a RuntimeError if a
+    module imports one of the heavy dependencies or takes longer than
+    maxSeconds
+    :param modules: dict w/ {module: [allowed heavy modules]}, defaults to
+                    guardedModules
+    :param maxSeconds: float w/ max. import time per module, None to only
+                       report the time
+    :param repeat: int w/ number of interpreters per module
+    :rtype results: dict w/ {module: (seconds, loaded)}
+    """
+    if modules is None:
+        modules = guardedModules
+
+    results, failures = {}, []
+    for module, allowed in modules.items():
+        seconds, loaded = measureImport(module, repeat)
+        results[module] = (seconds, loaded)
+
+        unexpected = [m for m in loaded if not (m in allowed)]
+        print("{:<40} {:>7.3f} s  {}".format(module, seconds, ", ".join(loaded)))
+
+        if unexpected:
+            failures.append(module + " imports " + ", ".join(unexpected))
+        if not (maxSeconds is None) and seconds > maxSeconds:
+            failures.append(module + " takes %.3f s to import" % seconds)
+
+    if failures:
+        raise RuntimeError("Import regression: " + "; ".join(failures))
+    return results
+
+# ------------------------------------------------------------------------------
+# Tests / Example
+# ------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    checkImports(maxSeconds=float(sys.argv[1]) if len(sys.argv) > 1 else None)
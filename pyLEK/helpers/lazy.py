@@ -0,0 +1,36 @@
+# ------------------------------------------------------------------------------
+# Description:  Importing the submodules of a package on first access
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Import functions / collections (from pyLEK.helpers.lazy import lazyModule)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import importlib
+# ------------------------------------------------------------------------------
+# Functions
+# ------------------------------------------------------------------------------
+
+
+def lazyModule(name, submodules):
+    """Module attributes of a package importing its submodules on first
+    access, e.g. pyLEK.plotters.plot2D, use in the __init__ of the package:
+    __getattr__, __dir__ = lazyModule(__name__, {"plot2D", ...})
+    :param name: string w/ __name__ of the package
+    :param submodules: set w/ names of the submodules
+    :rtype __getattr__: function for the package namespace
+    :rtype __dir__: function for the package namespace
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(attr):
+        if attr in submodules:
+            return importlib.import_module("." + attr, name)
+        raise AttributeError("module " + repr(name) + " has no attribute " + repr(attr))
+
+    def __dir__():
+        import sys
+        return sorted(set(vars(sys.modules[name])) | submodules)
+
+    return __getattr__, __dir__
@@ -8,8 +8,6 @@
 # Libraries
 # ------------------------------------------------------------------------------
 
-import scipy.io
-
 # ------------------------------------------------------------------------------
 # Functions
 # ------------------------------------------------------------------------------
@@ -23,6 +21,8 @@ def loadMat(filename):
     :rtype mat: list  with content of .mat file
     :rtype keys: list of all keys of .mat file
     """
+    import scipy.io
+
     # load .mat file
     mat = scipy.io.loadmat(filename)
 
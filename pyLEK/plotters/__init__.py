@@ -0,0 +1,8 @@
+from pyLEK.helpers.lazy import lazyModule
+
+# Submodules are imported on first access, e.g. pyLEK.plotters.plot2D
+_submodules = {"plot1D", "plot2D", "plot3D_surf", "plot3D_trisurf", "plot4D_surf",
+               "plotBarChart", "plotPieChart", "plotScatter", "plotHelpers",
+               "plotData", "plotAnnotations", "renderCache", "plotStyle"}
+
+__getattr__, __dir__ = lazyModule(__name__, _submodules)
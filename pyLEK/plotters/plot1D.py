@@ -10,7 +10,6 @@
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
-import pickle as pkl
 import numpy as np
 import os
 import sys
@@ -22,18 +21,22 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotAnnotations as plotAnnotations
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=None,
            dir_fileName=None, vLines=None, vTexts=None,
            xlim=[], ylim=[-0.5, 0.5], xticks=True, xscale='linear',  xlabelformat='%.1f',
            style_dict={}, mpl='_1D', colorScheme='Monochrome', variation='color', customCycler=None,
            savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-           fig=None, ax=None, annotate=[]):
+           fig=None, ax=None, keepFig=False, cache=False, rasterize=False, annotate=[], annotateCull=False):
     """Plotting 2-D Lines (x,y-plot) on one figure in a uniform style
     :param x: list w/ data to plot, with shape [n_row, datapoints]
     :param s: list w/ size of markers to plot, with shape [datapoints] 
@@ -62,18 +65,24 @@ def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=No
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten 
     :param ax: ax object to be overwritten 
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param annotate: list w/ tuples (text, (x, y)) or (text, (x, y), priority)
+    :param annotateCull: bool true to draw only the labels within the limits,
+                         overlapping labels w/ lower priority are left out
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
@@ -81,9 +90,10 @@ def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=No
     # Prepare Plots
     y = np.zeros(len(x), )
 
-    # An empty figure with one axe
-    if fig is None:
-        fig, ax = plt.subplots()
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -114,11 +124,6 @@ def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=No
     if xlabelformat:
         ax.xaxis.set_major_formatter(FormatStrFormatter(xlabelformat))
 
-    # Anmerkungen für Punkte im Plot
-    if annotate:
-        for a in annotate:
-            ax.annotate(a[0], a[1])
-
     # Add vertical line / arrow on spine
     if True and xlim:
         ax.plot(1.00, 0, ">k", transform=ax.get_yaxis_transform(),
@@ -199,18 +204,26 @@ def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=No
                     horizontalalignment='right', verticalalignment='bottom',
                     fontsize='x-small')
 
+    # Anmerkungen für Punkte im Plot, culled when the limits are known
+    if annotate:
+        plotAnnotations.AnnotationLayer(ax, annotate, cull=annotateCull)
+
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
-            plt.savefig(dir_fileName + ".png")
+            plotHelpers.saveFigure(fig, dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName + ".png")
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -221,17 +234,13 @@ def plot1D(x, *, s=None, c=None, xlabel=None, ylabel=None, title=None, legend=No
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
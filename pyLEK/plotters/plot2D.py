@@ -10,10 +10,11 @@
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
-import pickle as pkl
 import numpy as np
+import time
 import os
 import sys
+import warnings
 
 # ----------------------------------------------------------------------
 # Imported functions
@@ -22,21 +23,29 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotAnnotations as plotAnnotations
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
            dir_fileName=None, vLines=None, vTexts=None,  hLines=None, hTexts=None,
            xlim=[], ylim=[], xscale='linear', yscale='linear', xlabelformat='%.1f', ylabelformat='%.1f',
            style_dict={}, mpl='_2D', colorScheme='Monochrome', variation='color', customCycler=None,
            savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-           fig=None, ax=None, annotate=[]):
+           fig=None, ax=None, keepFig=False, cache=False, rasterize=False, annotate=[], annotateCull=False,
+           decimate=None, decimateOnZoom=False, collection=False, window=None):
     """Plotting 2-D Lines (x,y-plot) on one figure in a uniform style
     :param x: list w/ data to plot, with shape [n_row, datapoints]
-    :param y: list w/ data to plot, with shape [n_row, datapoints]
+    :param y: list w/ data to plot, with shape [n_row, datapoints], the
+              series may differ in length (x as list w/ the same lengths
+              or one array for all series)
     :param xlabel: string w/ labels for x axis
     :param xlabel: string w/ labels for y axis
     :param title: string w/ plot title
@@ -64,29 +73,57 @@ def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten 
     :param ax: ax object to be overwritten 
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param annotate: list w/ tuples (text, (x, y)) or (text, (x, y), priority)
+    :param annotateCull: bool true to draw only the labels within the limits,
+                         overlapping labels w/ lower priority are left out
+    :param decimate: string ('minmax', 'lttb') to reduce long series to about
+                     the pixel width of the axe, minmax keeps all peaks
+    :param decimateOnZoom: bool true to decimate again for the visible range
+                           when the axe is zoomed
+    :param collection: bool true to draw all series as one LineCollection,
+                       faster for thousands of series, the legend is limited
+                       to the first plotData.maxLegendEntries series, markers
+                       of the cycler are not drawn
+    :param window: slice w/ datapoints to plot, array-likes (memmap, h5py,
+                   pandas) are sliced before reading, e.g. slice(0, None, 10)
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
 
-    # Prepare Plots
-    x = np.transpose(x)
-    y = np.transpose(y)
-
-    # An empty figure with one axe
-    if fig is None:
-        fig, ax = plt.subplots()
+    # Array-likes (memmap, h5py, pandas) are used w/o copies
+    x = plotData.asArray(x, window)
+    y = plotData.asArray(y, window)
+
+    # Prepare Plots, series of different lengths are packed into one buffer
+    ragged = plotData.isRagged(y)
+    if ragged:
+        x = plotData.RaggedSeries(x, y)
+        if not (decimate is None):
+            warnings.warn("decimate is not available for series of different lengths: Continuing w/o")
+            decimate = None
+    else:
+        x = np.transpose(x)
+        y = np.transpose(y)
+
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -116,11 +153,6 @@ def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
     if ylabelformat:
         ax.yaxis.set_major_formatter(FormatStrFormatter(ylabelformat))
 
-    # Anmerkungen für Punkte im Plot
-    if annotate:
-        for a in annotate:
-            ax.annotate(a[0], a[1])
-
     # Create color / linestyles
     if customCycler is None:
         customCycler = colorCycler.createCycler(colorScheme, variation)
@@ -129,19 +161,46 @@ def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
     ax.set_prop_cycle(customCycler)
 
     # 2D - Plot of the axe-object
-    ax.plot(x, y, label='label')
+    if collection:
+        # One artist for all series, colors / linestyles from the cycler
+        nBuckets = None if decimate is None else plotData.pixelWidth(ax)
+        lc = plotData.lineCollection(x, y, customCycler, decimate, nBuckets)
+        ax.add_collection(lc)
+        ax.autoscale_view()
+    elif ragged:
+        # One NaN-separated line per style of the cycler
+        nStyles = len(customCycler)
+        for first in range(min(nStyles, len(x))):
+            ax.plot(*x.nanSeparated(first, nStyles), label='label')
+    elif decimate is None:
+        ax.plot(x, y, label='label')
+    else:
+        # Long series reduced to about the pixel width of the axe
+        series = plotData.splitSeries(x, y)
+        nBuckets = plotData.pixelWidth(ax)
+        lines = []
+        for xs, ys in series:
+            lines += ax.plot(*plotData.decimate(xs, ys, nBuckets, decimate), label='label')
+
+        if decimateOnZoom:
+            plotData.DecimationUpdater(ax, lines, series, decimate)
 
     # Correctly ordering legend entries by replacing labels with entries
     # from the legend list. If this is not done there is not order in
     # the legend see: https://matplotlib.org/users/legend_guide.html
     if not (legend is None):
-        handles, labels = ax.get_legend_handles_labels()
+        if collection or ragged:
+            handles, labels = plotData.collectionLegend(legend, customCycler,
+                                                        len(lc.get_segments()) if collection else len(x))
+            leg = ax.legend(handles, labels)
+        else:
+            handles, labels = ax.get_legend_handles_labels()
 
-        for j, element in enumerate(legend, start=0):
-            labels[j] = element
+            for j, element in enumerate(legend, start=0):
+                labels[j] = element
 
-        # Setting the legend
-        leg = ax.legend(labels)
+            # Setting the legend
+            leg = ax.legend(labels)
 
         # Set line thickness / transparency of the legend to standart
         for line in leg.get_lines():
@@ -181,17 +240,25 @@ def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
                     hText, rotation=0, rotation_mode='anchor',
                     horizontalalignment='left', verticalalignment='bottom',
                     fontsize='x-small')
+    # Anmerkungen für Punkte im Plot, culled when the limits are known
+    if annotate:
+        plotAnnotations.AnnotationLayer(ax, annotate, cull=annotateCull)
+
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -202,20 +269,178 @@ def plot2D(x, y, *, xlabel=None, ylabel=None, title=None, legend=None,
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
+
+class StreamHandle:
+    """Handle of a live plot2D (see plot2D_stream), new samples are added
+    with append(), the lines are redrawn w/ blitting at most every refresh
+    seconds
+    """
+
+    def __init__(self, fig, ax, lines, history=10000, refresh=1/30, margin=0.25):
+        """
+        :param fig: fig object
+        :param ax: ax object
+        :param lines: list w/ one line object per series
+        :param history: int w/ max. number of samples shown per series
+        :param refresh: float w/ min. time between two redraws [s]
+        :param margin: float w/ headroom added when the limits are extended
+        """
+        self.fig = fig
+        self.ax = ax
+        self.lines = lines
+        self.history = history
+        self.refresh = refresh
+        self.margin = margin
+
+        # Ring buffer stored twice, the last samples are always one view
+        self._x = np.empty(2 * history)
+        self._y = np.empty((len(lines), 2 * history))
+        self._head = 0
+        self._count = 0
+
+        self._background = None
+        self._lastDraw = 0.0
+        self._pending = False
+        self.frames = 0
+        self.fullDraws = 0
+
+        for line in lines:
+            line.set_animated(True)
+        self._cid = fig.canvas.mpl_connect('draw_event', self._onDraw)
+
+    def data(self):
+        """Samples in the history window
+        :rtype x: array (view) w/ shape [datapoints]
+        :rtype y: array (view) w/ shape [n_row, datapoints]
+        """
+        start = (self._head - self._count) % self.history
+        return (self._x[start:start + self._count],
+                self._y[:, start:start + self._count])
+
+    def append(self, x, y):
+        """Adds samples to the plot
+        :param x: list w/ data, with shape [datapoints]
+        :param y: list w/ data, with shape [n_row, datapoints] or
+                  [datapoints] for a single series
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.asarray(y, dtype=float).reshape(len(self.lines), -1)
+
+        # Older samples than the history window are dropped right away
+        if len(x) > self.history:
+            x, y = x[-self.history:], y[:, -self.history:]
+
+        idx = (self._head + np.arange(len(x))) % self.history
+        self._x[idx] = self._x[idx + self.history] = x
+        self._y[:, idx] = self._y[:, idx + self.history] = y
+        self._head = (self._head + len(x)) % self.history
+        self._count = min(self._count + len(x), self.history)
+
+        self._pending = True
+        if time.perf_counter() - self._lastDraw >= self.refresh:
+            self.update()
+
+    def update(self):
+        """Redraws the lines, the whole figure is only drawn when the data
+        leaves the limits of the axe
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        self._lastDraw = time.perf_counter()
+
+        x, y = self.data()
+        for line, row in zip(self.lines, y):
+            line.set_data(x, row)
+
+        canvas = self.fig.canvas
+        extended = self._count > 0 and self._extendLimits(x, y)
+        if extended or self._background is None:
+            # Ticks / limits changed, the background is saved again in _onDraw
+            canvas.draw()
+            self.fullDraws += 1
+        else:
+            canvas.restore_region(self._background)
+            self._drawLines()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self.frames += 1
+
+    def _extendLimits(self, x, y):
+        # True if the limits had to be changed
+        changed = False
+        lower, upper = self.ax.get_xlim()
+        xmin, xmax = x[0], x[-1]
+        if xmax > upper or xmin < lower:
+            span = max(xmax - xmin, abs(xmax) * 1e-9, 1e-12)
+            self.ax.set_xlim(xmin, xmax + self.margin * span)
+            changed = True
+
+        lower, upper = self.ax.get_ylim()
+        ymin, ymax = np.nanmin(y), np.nanmax(y)
+        if ymax > upper or ymin < lower:
+            span = max(ymax - ymin, abs(ymax) * 1e-9, 1e-12)
+            self.ax.set_ylim(ymin - self.margin * span, ymax + self.margin * span)
+            changed = True
+        return changed
+
+    def _onDraw(self, event):
+        # Background w/o the lines after every full draw
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._drawLines()
+
+    def _drawLines(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def close(self):
+        """Stops the updates, the lines are drawn normally again
+        """
+        self.update()
+        self.fig.canvas.mpl_disconnect(self._cid)
+        for line in self.lines:
+            line.set_animated(False)
+
+
+def plot2D_stream(nSeries=1, *, history=10000, refresh=1/30, xlabel=None, ylabel=None,
+                  title=None, legend=None, xlim=[], ylim=[], xscale='linear', yscale='linear',
+                  xlabelformat='%.1f', ylabelformat='%.1f',
+                  style_dict={}, mpl='_2D', colorScheme='Monochrome', variation='color', customCycler=None,
+                  showPlt=False, fig=None, ax=None):
+    """Live 2-D Lines (x,y-plot), the samples are added to the returned
+    handle by handle.append(x, y)
+    :param nSeries: int w/ number of lines
+    :param history: int w/ max. number of samples shown per line
+    :param refresh: float w/ min. time between two redraws [s]
+    :param showPlt: bool true to show the plot w/o blocking
+    :param fig: fig object to be overwritten, e.g. of a gui-canvas
+    :param ax: ax object to be overwritten
+    other params see plot2D
+    :rtype handle: StreamHandle
+    """
+    fig, ax = plot2D(np.empty(0), np.empty((nSeries, 0)), xlabel=xlabel, ylabel=ylabel,
+                     title=title, legend=legend, xlim=xlim, ylim=ylim, xscale=xscale, yscale=yscale,
+                     xlabelformat=xlabelformat, ylabelformat=ylabelformat,
+                     style_dict=style_dict, mpl=mpl, colorScheme=colorScheme, variation=variation,
+                     customCycler=customCycler, fig=fig, ax=ax, keepFig=True)
+
+    handle = StreamHandle(fig, ax, ax.get_lines()[-nSeries:], history, refresh)
+
+    if showPlt == True:
+        plt.show(block=False)
+
+    return handle
+
 # ----------------------------------------------------------------------
 # Tests / Example
 # ----------------------------------------------------------------------
@@ -362,6 +587,22 @@ def sample_4(*, showPlt=True, fig=None, ax=None):
     return fig, ax
 
 
+def sample_stream(*, showPlt=True, fig=None, ax=None):
+    # FIFTH PLOT
+    # Live plot of a measurement, only the last 2000 samples are shown
+    handle = plot2D_stream(2, history=2000, refresh=1/30, xlabel="Time [s]", ylabel="Signal",
+                           legend=["sin", "cos"], showPlt=showPlt, fig=fig, ax=ax)
+
+    for i in range(200):
+        t = np.arange(i * 50, (i + 1) * 50) / 500
+        handle.append(t, [np.sin(t), np.cos(t)])
+        if showPlt:
+            plt.pause(0.001)
+
+    handle.close()
+    return handle.fig, handle.ax
+
+
 if __name__ == "__main__":
     sample_1()
     sample_2()
@@ -9,9 +9,7 @@
 # ------------------------------------------------------------------------------
 
 import matplotlib.pyplot as plt
-import pickle as pkl
 import numpy as np
-import seaborn as sns
 import matplotlib.cm as cm
 import os
 import sys
@@ -23,22 +21,31 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plot3D_surf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, legend=None,
                 dir_fileName=None, colorbar=True, colorbar_loc='left',
                 xlim=[], ylim=[], zlim=[], xscale='linear', yscale='linear', zscale='linear',
                 style_dict={}, mpl='_3D', colormap='plasma',
                 savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                fig=None, ax=None):
+                fig=None, ax=None, keepFig=False, cache=False, rasterize=False, lod=True,
+                interpolate=None):
     """Plotting Surface plots (x,y,z-plot) on one figure in a uniform style
-    :param x: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data
+    :param x: list w/ data to plot, with shape [datapoints] - 1D-Data, or
+              [rows, columns] - 2D-Data
+    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data, or
+              [rows, columns] - 2D-Data
+    :param z: list w/ data to plot, with shape [datapoints] - 1D-Data (the
+              surface is z[i] * z[j]), or [rows, columns] - 2D-Data, e.g. a
+              field on the grid x[columns], y[rows]
     :param xlabel: string w/ labels for x axis
     :param ylabel: string w/ labels for y axis
     :param zlabel: string w/ labels for z axis
@@ -60,31 +67,46 @@ def plot3D_surf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, l
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten
     :param ax: ax object to be overwritten
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param lod: bool true to average large grids to about the resolution of
+                the figure, int w/ max. cells per direction, false to pass
+                the grid to matplotlib unchanged
+    :param interpolate: string ('linear', 'nearest', 'cubic') if x, y, z are
+                        scattered node results (1-D, one value per node),
+                        they are interpolated onto a grid w/ the resolution
+                        of the figure, the interpolator is cached per node layout
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
 
-    # An empty figure with one axe
-    if fig is None:
-        fig = plt.figure()
-        ax = fig.add_subplot(projection='3d')
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(projection='3d', pyplot=showPlt or keepFig)
+
+    # Scattered node results onto a grid w/ the resolution of the figure
+    if not (interpolate is None):
+        x, y, z = plotData.interpolateNodes(ax, x, y, z, interpolate)
 
-        # Reshape data
-    # convert to 2d matrices
-    Z = np.outer(z.T, z)
-    X, Y = np.meshgrid(x, y)
+    # Grid w/o copies, large grids are averaged in blocks (level of detail)
+    X, Y, Z, _ = plotData.surfaceGrid(ax, x, y, z, lod)
+
+    # All cells of a reduced grid are drawn, otherwise matplotlib samples it
+    counts = {'rcount': Z.shape[0], 'ccount': Z.shape[1]} if lod else {}
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -116,13 +138,13 @@ def plot3D_surf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, l
 
     # Create color / linestyles
     if colormap is None:
-        cmap = sns.color_palette("plasma", as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap("plasma")  # Get a CMap
     else:
-        cmap = sns.color_palette(colormap, as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap(colormap)  # Get a CMap
 
     # Surf-plot of the axe-object
     ax.plot_surface(X, Y, Z, label='label', edgecolor='none', linewidth=0,
-                    antialiased=True, cmap=cmap)
+                    antialiased=True, cmap=cmap, **counts)
 
     if colorbar:
         m = cm.ScalarMappable(cmap=cmap)
@@ -149,17 +171,21 @@ def plot3D_surf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, l
                     line.set_linewidth(0)
             line.set_alpha(1.0)
 
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -170,17 +196,13 @@ def plot3D_surf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, l
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -219,5 +241,17 @@ def sample_1(*, showPlt=True, fig=None, ax=None):
     return fig, ax
 
 
+def sample_2(*, showPlt=True, fig=None, ax=None):
+    # 2-D field, e.g. a FE result, reduced to the resolution of the figure
+    x = np.linspace(0, 10, 4000)
+    y = np.linspace(0, 5, 3000)
+    Z = np.sin(x)[None, :] * np.cos(2 * y)[:, None]
+
+    fig, ax = plot3D_surf(x, y, Z, xlabel="x", ylabel="y", zlabel="z",
+                          showPlt=showPlt, fig=fig, ax=ax)
+
+    return fig, ax
+
+
 if __name__ == "__main__":
     sample_1()
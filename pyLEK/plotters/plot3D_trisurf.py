@@ -9,9 +9,7 @@
 # ------------------------------------------------------------------------------
 
 import matplotlib.pyplot as plt
-import pickle as pkl
 import numpy as np
-import seaborn as sns
 import matplotlib.cm as cm
 import os
 import sys
@@ -23,22 +21,26 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plot3D_trisurf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None, legend=None,
                    dir_fileName=None, colorbar=True, colorbar_loc='left',
                    xlim=[], ylim=[], zlim=[], xscale='linear', yscale='linear', zscale='linear',
                    style_dict={}, mpl='_3D', colormap='plasma',
                    savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                   fig=None, ax=None):
+                   fig=None, ax=None, keepFig=False, cache=False, rasterize=False, triangulation=None):
     """Plotting Surface plots (x,y,z-plot) using triangulation on one figure in a uniform style
     :param x: list w/ data to plot, with shape [datapoints] - 1D-Data
     :param y: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data
+    :param z: list w/ data to plot, with shape [datapoints] - 1D-Data
     :param xlabel: string w/ labels for x axis
     :param ylabel: string w/ labels for y axis
     :param zlabel: string w/ labels for z axis
@@ -60,26 +62,32 @@ def plot3D_trisurf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten
     :param ax: ax object to be overwritten
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param triangulation: matplotlib.tri.Triangulation of the points (x and
+                          y are ignored), by default the triangulation of
+                          (x, y) is computed once and reused (plotData.triangulation)
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
 
-    # An empty figure with one axe
-    if fig is None:
-        fig = plt.figure()
-        ax = fig.add_subplot(projection='3d')
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(projection='3d', pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -111,12 +119,16 @@ def plot3D_trisurf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None
 
     # Create color / linestyles
     if colormap is None:
-        cmap = sns.color_palette("plasma", as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap("plasma")  # Get a CMap
     else:
-        cmap = sns.color_palette(colormap, as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap(colormap)  # Get a CMap
+
+    # Same (x, y) layout, e.g. time steps of z: triangulated only once
+    if triangulation is None:
+        triangulation = plotData.triangulation(x, y)
 
     # Trisurf-plot of the axe-object
-    ax.plot_trisurf(x, y, z, label='label', edgecolor='none', linewidth=0,
+    ax.plot_trisurf(triangulation, z, label='label', edgecolor='none', linewidth=0,
                     antialiased=True, cmap=cmap)
 
     if colorbar:
@@ -144,17 +156,21 @@ def plot3D_trisurf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None
                     line.set_linewidth(0)
             line.set_alpha(1.0)
 
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -165,17 +181,13 @@ def plot3D_trisurf(x, y, z, *, xlabel=None, ylabel=None, zlabel=None, title=None
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -9,9 +9,7 @@
 # ------------------------------------------------------------------------------
 
 import matplotlib.pyplot as plt
-import pickle as pkl
 import numpy as np
-import seaborn as sns
 import matplotlib.cm as cm
 import matplotlib.colors as co
 import os
@@ -24,23 +22,32 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plot4D_surf(x, y, z, c, *, xlabel=None, ylabel=None, zlabel=None, title=None, legend=None,
                 dir_fileName=None, colorbar=True, colorbar_loc='left',
                 xlim=[], ylim=[], zlim=[], xscale='linear', yscale='linear', zscale='linear',
                 style_dict={}, mpl='_3D', colormap='plasma',
                 savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                fig=None, ax=None):
+                fig=None, ax=None, keepFig=False, cache=False, rasterize=False, lod=True,
+                interpolate=None):
     """Plotting Surface + color plots (x,y,z,c-plot) on one figure in a uniform style
-    :param x: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param z: list w/ data to plot, with shape [datapoints] - 1D-Data
-    :param c: list w/ data to plot, with shape [datapoints] - 1D-Data
+    :param x: list w/ data to plot, with shape [datapoints] - 1D-Data, or
+              [rows, columns] - 2D-Data
+    :param y: list w/ data to plot, with shape [datapoints] - 1D-Data, or
+              [rows, columns] - 2D-Data
+    :param z: list w/ data to plot, with shape [datapoints] - 1D-Data (the
+              surface is z[i] * z[j]), or [rows, columns] - 2D-Data
+    :param c: list w/ data to plot, with shape [datapoints] - 1D-Data (the
+              color is c[i] * c[j]), or [rows, columns] - 2D-Data
     :param xlabel: string w/ labels for x axis
     :param ylabel: string w/ labels for y axis
     :param zlabel: string w/ labels for z axis
@@ -62,32 +69,56 @@ def plot4D_surf(x, y, z, c, *, xlabel=None, ylabel=None, zlabel=None, title=None
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten
     :param ax: ax object to be overwritten
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param lod: bool true to average large grids to about the resolution of
+                the figure, int w/ max. cells per direction, false to draw
+                every cell
+    :param interpolate: string ('linear', 'nearest', 'cubic') if x, y, z are
+                        scattered node results (1-D, one value per node),
+                        they are interpolated onto a grid w/ the resolution
+                        of the figure, the interpolator is cached per node layout
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
 
-    # An empty figure with one axe
-    if fig is None:
-        fig = plt.figure()
-        ax = fig.add_subplot(projection='3d')
-
-    # Reshape data
-    # convert to 2d matrices
-    Z = np.outer(z.T, z)
-    c = np.outer(c.T, c)
-    X, Y = np.meshgrid(x, y)
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(projection='3d', pyplot=showPlt or keepFig)
+
+    # Scattered node results onto a grid w/ the resolution of the figure,
+    # surface and colors in one batch
+    if not (interpolate is None):
+        x, y, fields = plotData.interpolateNodes(ax, x, y, np.vstack((z, c)), interpolate)
+        z, c = fields
+
+    # Grid w/o copies, large grids are averaged in blocks (level of detail),
+    # the colors w/ the same blocks
+    X, Y, Z, factors = plotData.surfaceGrid(ax, x, y, z, lod)
+    c = plotData.asArray(c)
+    C = plotData.surfaceField(c, factors)
+
+    # Color range of the full data
+    if np.ndim(c) == 1:
+        ends = [np.nanmin(c), np.nanmax(c)]
+        products = np.outer(ends, ends)
+        minn, maxx = products.min(), products.max()
+    else:
+        minn, maxx = np.nanmin(c), np.nanmax(c)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -119,24 +150,22 @@ def plot4D_surf(x, y, z, c, *, xlabel=None, ylabel=None, zlabel=None, title=None
 
     # Create color / linestyles
     if colormap is None:
-        cmap = sns.color_palette("plasma", as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap("plasma")  # Get a CMap
     else:
-        cmap = sns.color_palette(colormap, as_cmap=True)  # Get a CMap
+        cmap = plotHelpers.getColormap(colormap)  # Get a CMap
 
-    # fourth dimention - colormap according to c-value
-    color_dimension = c
-    minn, maxx = color_dimension.min(), color_dimension.max()
+    # fourth dimention - colormap according to c-value, mapped by a cached
+    # uint8 lookup table instead of float rgba of the full field
     norm = co.Normalize(minn, maxx)
-    m = plt.cm.ScalarMappable(norm=norm, cmap=cmap)
-    m.set_array([])
-    fcolors = m.to_rgba(color_dimension)
+    lut = plotData.colormapLut(cmap)
+    fcolors = lut[plotData.lutIndices(C, minn, maxx)].astype(np.float32) / 255
 
-    # surf-plot of the axe-object
-    ax.plot_surface(X, Y, Z, rstride=1, cstride=1,
+    # surf-plot of the axe-object, every cell of the (reduced) grid
+    ax.plot_surface(X, Y, Z, rcount=Z.shape[0], ccount=Z.shape[1],
                     facecolors=fcolors, vmin=minn, vmax=maxx, shade=False)
 
     if colorbar:
-        m = cm.ScalarMappable(cmap=cmap)
+        m = cm.ScalarMappable(norm=norm, cmap=cmap)
         fig.colorbar(m, ax=ax, location=colorbar_loc, shrink=0.5, )
 
     # Correctly ordering legend entries by replacing labels with entries
@@ -160,17 +189,21 @@ def plot4D_surf(x, y, z, c, *, xlabel=None, ylabel=None, zlabel=None, title=None
                     line.set_linewidth(0)
             line.set_alpha(1.0)
 
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -181,17 +214,13 @@ def plot4D_surf(x, y, z, c, *, xlabel=None, ylabel=None, zlabel=None, title=None
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -0,0 +1,327 @@
+# ------------------------------------------------------------------------------
+# Description:  Annotating many points, overlapping labels can be left out
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Import functions / collections (from pyLEK.plotters import plotAnnotations)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import numpy as np
+from matplotlib.artist import Artist
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+# Space between two labels in pixels
+labelPadding = 2.0
+
+
+def parseAnnotations(annotate):
+    """Splits the annotate argument of the plotters into arrays
+    :param annotate: list w/ tuples (text, (x, y)) or (text, (x, y), priority),
+                     labels w/ higher priority are placed first, otherwise the
+                     order of the list
+    :rtype texts: list w/ strings
+    :rtype xy: array w/ positions, shape [n, 2]
+    :rtype priority: array w/ priorities, shape [n]
+    """
+    texts = [str(a[0]) for a in annotate]
+    xy = np.array([a[1] for a in annotate], dtype=float).reshape(-1, 2)
+    priority = np.array([a[2] if len(a) > 2 else 0.0 for a in annotate], dtype=float)
+    return texts, xy, priority
+
+
+def textExtents(texts, prop=None, dpi=72.0):
+    """Size of many labels, each character is measured once and the widths
+    are summed up per label (kerning is neglected), labels w/ mathtext are
+    measured as a whole
+    :param texts: list w/ strings
+    :param prop: FontProperties, defaults to the current text style
+    :param dpi: float w/ dots per inch
+    :rtype width: array w/ widths in pixels
+    :rtype height: array w/ heights above the baseline in pixels
+    :rtype descent: array w/ depths below the baseline in pixels
+    """
+    from matplotlib.backends.backend_agg import RendererAgg
+    from matplotlib.font_manager import FontProperties
+
+    if prop is None:
+        prop = FontProperties()
+    renderer = RendererAgg(1, 1, dpi)
+
+    # Line metrics of the font
+    _, lineHeight, lineDescent = renderer.get_text_width_height_descent("lp", prop, ismath=False)
+    lineSpacing = lineHeight * 1.2
+
+    chars = {}
+    width, height, descent = (np.zeros(len(texts)) for i in range(3))
+    for i, text in enumerate(texts):
+        lines = text.split('\n')
+        if '$' in text:
+            w, h, d = renderer.get_text_width_height_descent(text, prop, ismath=True)
+            width[i], height[i], descent[i] = w, h - d, d
+            continue
+
+        for line in lines:
+            for ch in line:
+                if not (ch in chars):
+                    chars[ch] = renderer.get_text_width_height_descent(ch, prop, ismath=False)[0]
+        width[i] = max(sum(chars[ch] for ch in line) for line in lines)
+        height[i] = lineHeight - lineDescent
+        descent[i] = lineDescent + lineSpacing * (len(lines) - 1)
+
+    return width, height, descent
+
+
+def cullAnnotations(px, width, height, descent, bounds, overlap=False,
+                    padding=labelPadding):
+    """Labels within bounds which do not overlap w/ a label placed before,
+    checked in a grid of cells of the size of the largest label
+    :param px: array w/ anchor points (left, baseline) in pixels, shape [n, 2],
+               in order of priority
+    :param width: array w/ widths in pixels
+    :param height: array w/ heights above the baseline in pixels
+    :param descent: array w/ depths below the baseline in pixels
+    :param bounds: tuple w/ visible area (x0, y0, x1, y1) in pixels
+    :param overlap: bool true to keep overlapping labels
+    :param padding: float w/ min. space between two labels in pixels
+    :rtype idx: array w/ indices of the labels to draw
+    """
+    x0, y0, x1, y1 = bounds
+    with np.errstate(invalid='ignore'):
+        visible = ((px[:, 0] >= x0) & (px[:, 0] <= x1) &
+                   (px[:, 1] >= y0) & (px[:, 1] <= y1))
+    candidates = np.flatnonzero(visible)
+    if overlap or len(candidates) < 2:
+        return candidates
+
+    # Boxes of the candidates incl. padding
+    left = px[candidates, 0] - padding
+    right = px[candidates, 0] + width[candidates] + padding
+    bottom = px[candidates, 1] - descent[candidates] - padding
+    top = px[candidates, 1] + height[candidates] + padding
+
+    # A box covers at most two cells in each direction
+    cellW = max(float(np.max(right - left)), 1.0)
+    cellH = max(float(np.max(top - bottom)), 1.0)
+    i0, i1 = np.floor(left / cellW).astype(int), np.floor(right / cellW).astype(int)
+    j0, j1 = np.floor(bottom / cellH).astype(int), np.floor(top / cellH).astype(int)
+
+    grid = {}
+    placed = []
+    for k in range(len(candidates)):
+        cells = [(i, j) for i in range(i0[k], i1[k] + 1) for j in range(j0[k], j1[k] + 1)]
+
+        free = True
+        for cell in cells:
+            for m in grid.get(cell, ()):
+                if (left[k] < right[m] and left[m] < right[k] and
+                        bottom[k] < top[m] and bottom[m] < top[k]):
+                    free = False
+                    break
+            if not free:
+                break
+
+        if free:
+            placed.append(k)
+            for cell in cells:
+                grid.setdefault(cell, []).append(k)
+
+    return candidates[placed]
+
+
+class _CullOnDraw(Artist):
+    """Invisible artist of the figure, drawn before the axes: culls the
+    labels of an AnnotationLayer w/ the final layout of the figure
+    (tight_layout, resize, dpi of savefig)
+    """
+
+    def __init__(self, layer):
+        super().__init__()
+        self.layer = layer
+        self.set_zorder(-np.inf)
+        self.set_in_layout(False)
+
+    def draw(self, renderer):
+        self.layer.update()
+
+
+class AnnotationLayer:
+    """Labels of many points. W/ cull, only the ones visible at the current
+    limits and not overlapping are shown, checked again whenever the limits
+    change (e.g. when zooming in the GUI) and before each draw of the figure
+    (e.g. after a resize)
+    """
+
+    def __init__(self, ax, annotate, cull=False, **kwargs):
+        """
+        :param ax: ax object
+        :param annotate: list w/ tuples (text, (x, y)) or (text, (x, y), priority)
+        :param cull: bool true to leave out labels outside the limits and
+                     labels overlapping one w/ higher priority
+        :param kwargs: further arguments of ax.annotate
+        """
+        from matplotlib.font_manager import FontProperties
+
+        self.ax = ax
+        self.cull = cull
+        self.kwargs = kwargs
+
+        texts, xy, priority = parseAnnotations(annotate)
+        if not cull:
+            # All labels, as ax.annotate for each one
+            self.texts, self.xy = texts, xy
+            self.artists = {i: ax.annotate(texts[i], xy[i], **kwargs)
+                            for i in range(len(texts))}
+            self.cids = []
+            self.trigger = None
+            return
+
+        order = np.argsort(-priority, kind='stable')
+        self.texts = [texts[i] for i in order]
+        self.xy = xy[order]
+
+        # Measured once at the dpi of the figure, scaled w/ the dpi later
+        self.dpi = ax.get_figure().dpi
+        self.width, self.height, self.descent = textExtents(
+            self.texts, FontProperties(size=kwargs.get('fontsize')), self.dpi)
+
+        # Created when shown for the first time {index: annotation}
+        self.artists = {}
+        self.last = None
+        self.update()
+
+        # Plain functions are kept by the callback registry, bound methods not
+        self.cids = [ax.callbacks.connect(signal, lambda ax: self.update())
+                     for signal in ('xlim_changed', 'ylim_changed')]
+
+        # Layout and size of the figure are final when it is drawn
+        self.trigger = ax.get_figure().add_artist(_CullOnDraw(self))
+
+    def visible(self):
+        """Labels to draw at the current limits
+        :rtype idx: array w/ indices of self.texts
+        """
+        ax = self.ax
+        # Autoscaled limits are calculated on access
+        ax.get_xlim(), ax.get_ylim()
+        px = ax.transData.transform(self.xy)
+        scale = ax.get_figure().dpi / self.dpi
+        return cullAnnotations(px, self.width * scale, self.height * scale,
+                               self.descent * scale, ax.bbox.extents, False,
+                               labelPadding * scale)
+
+    def update(self):
+        """Shows the labels to draw at the current limits and size of the axe
+        and hides the others, the next (pending) draw of the figure picks
+        them up
+        """
+        # Limits are changed in x and y one after another
+        state = (tuple(self.ax.viewLim.bounds), tuple(self.ax.bbox.bounds))
+        if self.last == state:
+            return
+        self.last = state
+
+        shown = set(self.visible().tolist())
+        for i, artist in self.artists.items():
+            artist.set_visible(i in shown)
+        for i in shown.difference(self.artists):
+            self.artists[i] = self.ax.annotate(self.texts[i], self.xy[i], **self.kwargs)
+
+    def shown(self):
+        """Labels currently shown
+        :rtype artists: list w/ annotations
+        """
+        return [artist for artist in self.artists.values() if artist.get_visible()]
+
+    def disconnect(self):
+        for cid in self.cids:
+            self.ax.callbacks.disconnect(cid)
+        if self.trigger is not None:
+            self.trigger.remove()
+            self.trigger = None
+
+
+def barAnnotations(ax, rects, texts, position='above', color=None, fit=False):
+    """Labels of many bars, positions are calculated for all bars at once
+    :param ax: ax object
+    :param rects: tuple w/ arrays (x, y, width, height) of the bars in data
+                  coordinates, as matplotlib.patches.Rectangle
+    :param texts: list w/ strings, one per bar
+    :param position: string ('above', 'center', 'right')
+    :param color: color of the labels, 'center' is always white
+    :param fit: bool true to leave out labels wider (above, center) or higher
+                (right, center) than their bar
+    :rtype artists: list w/ text objects
+    """
+    from matplotlib.font_manager import FontProperties
+
+    x, y, width, height = (np.asarray(a, dtype=float) for a in rects)
+
+    # Offsets relative to the limits, as for single bars
+    ymax = ax.get_ylim()[1]
+    xmax = ax.get_xlim()[1]
+
+    if position == 'above':
+        xp, yp = x + width / 2, y + height + 0.0175 * ymax
+        va, ha = 'center', 'center'
+    elif position == 'right':
+        xp, yp = x + width + 0.005 * xmax, y + height / 2
+        va, ha = 'center_baseline', 'left'
+    elif position == 'center':
+        xp, yp = x + width / 2, y + height / 2
+        va, ha = 'center', 'center'
+        color = 'white'
+    else:
+        print('Unknown option for annotation position')
+        return []
+
+    keep = np.ones(len(xp), dtype=bool)
+    if fit and len(xp):
+        # Size of the labels and bars in pixels
+        textWidth, textHeight, textDescent = textExtents(
+            list(texts), FontProperties(size='x-small'), ax.get_figure().dpi)
+        corners = ax.transData.transform(np.column_stack((x, y)))
+        size = np.abs(ax.transData.transform(np.column_stack((x + width, y + height))) - corners)
+
+        if position in ('above', 'center'):
+            keep &= textWidth <= size[:, 0]
+        if position in ('right', 'center'):
+            keep &= textHeight + textDescent <= size[:, 1]
+
+    return [ax.text(xp[k], yp[k], texts[k], fontsize='x-small', va=va, ha=ha, color=color)
+            for k in np.flatnonzero(keep)]
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def sample(n=5000):
+    import time
+    import matplotlib.figure
+
+    rng = np.random.default_rng(0)
+    x, y = rng.standard_normal(n), rng.standard_normal(n)
+    annotate = [("P" + str(i), (x[i], y[i]), abs(x[i] * y[i])) for i in range(n)]
+
+    fig = matplotlib.figure.Figure()
+    ax = fig.add_subplot()
+    ax.scatter(x, y, s=2)
+
+    start = time.perf_counter()
+    layer = AnnotationLayer(ax, annotate, cull=True)
+    fig.draw_without_rendering()
+    print("{} of {} labels drawn in {:.3f} s".format(len(layer.shown()), n,
+                                                    time.perf_counter() - start))
+
+    # Zoomed in, more labels fit
+    ax.set_xlim(-0.5, 0.5)
+    ax.set_ylim(-0.5, 0.5)
+    print("{} labels after zooming".format(len(layer.shown())))
+
+
+if __name__ == "__main__":
+    sample()
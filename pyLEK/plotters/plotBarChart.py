@@ -10,7 +10,6 @@
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
-import pickle as pkl
 import numpy as np
 import matplotlib.ticker as mtick
 
@@ -21,22 +20,36 @@ import matplotlib.ticker as mtick
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotAnnotations as plotAnnotations
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+def _barRects(position, value, base, width, orientation):
+    # Rectangles (x, y, width, height) of centered bars, as ax.bar / ax.barh
+    position, value = np.asarray(position, dtype=float), np.asarray(value, dtype=float)
+    base = np.broadcast_to(np.asarray(base, dtype=float), value.shape)
+    if orientation == 'horizontal':
+        return base, position - width / 2, value, np.full(value.shape, width)
+    return position - width / 2, base, np.full(value.shape, width), value
+
+
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
                  xticks=None, xticklabels=None, xticksrotation=None,
                  yticks=None, yticklabels=None, yticksrotation=None,
-                 barChart='stacked', annotations=None, annotations_position='above',
+                 barChart='stacked', annotations=None, annotations_position='above', annotations_fit=False,
                  orientation='vertical', bar_width=0.8, bar_spacing=0.2,
                  dir_fileName=None, vLines=None, vTexts=None,  hLines=None, hTexts=None,
                  xlim=[], ylim=[], xscale='linear', yscale='linear', xlabelformat='%.1f', ylabelformat='%.1f',
                  style_dict={}, mpl='_barchart_v', colorScheme='Monochrome', variation='color', customCycler=None,
                  savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                 fig=None, ax=None):
+                 fig=None, ax=None, keepFig=False, cache=False, rasterize=False, window=None):
     """Plotting bar charts on one figure in a uniform style
     :param y: np.array w/ data to plot, with shape [n_datasets, datapoints]
     :param xlabel: string w/ labels for x axis
@@ -52,6 +65,9 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
     :param barChart: string ('stacked', 'grouped')
     :param annotations: string ('%', 'individual','sum') or None
     :param annotations_position: string ('above', 'center', 'right')
+    :param annotations_fit: bool true to leave out labels which do not fit
+                            into the width (above) / height (right) / both
+                            (center) of their bar
     :param orientation: string ('horizontal', 'vertical')
     :param barWidth: float w/ width of bars
     :param bar_spacing: float w/ spacing of bars for grouped bar chart (1=no space between bars)
@@ -76,18 +92,26 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten
     :param ax: ax object to be overwritten
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param window: slice w/ datapoints to plot, array-likes (memmap, h5py,
+                   pandas) are sliced before reading, e.g. slice(0, None, 10)
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Array-likes (memmap, h5py, pandas) are used w/o copies
+    y = plotData.asArray(y, window)
 
     # Prepare Plots
     if y is not None:
@@ -97,9 +121,10 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
     if not isinstance(y, np.ndarray):
         y = np.asarray(y)
 
-    # An empty figure with one axe
-    if fig is None:
-        fig, ax = plt.subplots()
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -137,6 +162,9 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
     # Bar width (1=no space between bars)
     bar_width = bar_width
 
+    # Columns (x) and rectangles of the bars of each dataset, for the annotations
+    bars_geometry = []
+
     # Stacked Bar Chart - Plot of the axe-object
     if barChart == 'stacked':
         bars_set = []
@@ -168,6 +196,7 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
             elif orientation == 'horizontal':
                 bars_set.append(ax.barh(x, yi, left=bottom[i], height=bar_width,
                                         label='label', edgecolor='white', linewidth=0.5, alpha=0.7))
+            bars_geometry.append((x, _barRects(x, yi, bottom[i], bar_width, orientation)))
             i = i + 1
 
     elif barChart == 'stacked100%':
@@ -182,6 +211,7 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
             elif orientation == 'horizontal':
                 bars_set.append(ax.barh(x, yi_rel, left=bottom, height=bar_width,
                                         label='label', edgecolor='white', linewidth=0.5, alpha=0.7))
+            bars_geometry.append((x, _barRects(x, yi_rel, bottom, bar_width, orientation)))
             bottom = bottom + yi_rel
 
         # Set labels to %
@@ -194,103 +224,59 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
 
     elif barChart == 'grouped':
         bars_set = []
-        i_ = 0
-        for i, yi in enumerate(y):
-            w = bar_width/len(y)
-            s = bar_spacing/len(y)
-            x_pos = []
-            for x_i in range(y.shape[1]):
-
-                valid_count = sum(1 for x in y[:, x_i] if x is not None)
-
-                if y[i, x_i] == None:
-                    i_ -= 1
-
-                if None in y[:, x_i]:
-                    x_pos.append(x[x_i] - (w/2 + s/2) *
-                                 (y.shape[0] - (y.shape[0] - valid_count) - 1) + i_ * (w + s))
-                else:
-                    x_pos.append(x[x_i] - (w/2 + s/2) *
-                                 (y.shape[0] - 1) + i * (w + s))
-            i_ += 1
-
-            # Filter out None values from yi and x_pos
-            x_pos, yi = zip(*[(x, y)
-                              for x, y in zip(x_pos, yi) if y is not None])
+        w = bar_width/len(y)
+        s = bar_spacing/len(y)
+
+        # Missing bars (None / NaN) are left out, the remaining bars of a
+        # group are centered
+        values = plotData.missingAsNan(y)
+        valid = ~np.isnan(values)
+        valid_count = valid.sum(axis=0)
+        rank = np.cumsum(valid, axis=0) - 1
+
+        x_pos = x - (w/2 + s/2) * (valid_count - 1) + rank * (w + s)
+
+        for i in range(len(values)):
             if orientation == 'vertical':
-                bars_set.append(ax.bar(x_pos, yi, width=w,
+                bars_set.append(ax.bar(x_pos[i, valid[i]], values[i, valid[i]], width=w,
                                        label='label', edgecolor='white', linewidth=0.5, alpha=0.7))
             elif orientation == 'horizontal':
-                bars_set.append(ax.barh(x_pos, yi, height=w,
+                bars_set.append(ax.barh(x_pos[i, valid[i]], values[i, valid[i]], height=w,
                                         label='label', edgecolor='white', linewidth=0.5, alpha=0.7))
+            bars_geometry.append((x[valid[i]], _barRects(
+                x_pos[i, valid[i]], values[i, valid[i]], 0.0, w, orientation)))
 
-    # Add text annotations to the top of the bars.
+    # Add text annotations to the top of the bars. Totals and strings are
+    # computed once for all bars
     if not (annotations is None):
-
-        # Get maximal size of y-axis for text alignment
-        ymax = ax.get_ylim()[1]
-        xmax = ax.get_xlim()[1]
-
-        # Loop overs datasets
-        for i, bars in enumerate(bars_set):
-
-            # Loop over bars in each dataset
-            for j, bar in enumerate(bars):
-
-                # Position of text and grab the color of bars so the text gets the same color
-                if annotations_position == 'above':
-                    x_pos = bar.get_x() + bar.get_width() / 2
-                    y_pos = bar.get_y() + bar.get_height() + 0.0175 * ymax
-                    bar_color = bars[0].get_facecolor()
-                    va = 'center'
-                    ha = 'center'
-                elif annotations_position == 'right':
-                    x_pos = bar.get_x() + bar.get_width() + 0.005 * xmax
-                    y_pos = bar.get_y() + bar.get_height() / 2
-                    bar_color = bars[0].get_facecolor()
-                    va = 'center_baseline'
-                    ha = 'left'
-                elif annotations_position == 'center':
-                    x_pos = bar.get_x() + bar.get_width() / 2
-                    y_pos = bar.get_y() + bar.get_height() / 2
-                    bar_color = 'white'
-                    va = 'center'
-                    ha = 'center'
-                else:
-                    print('Unknown option for annotation position')
-
-                # Get the text
-                if annotations == 'individual':
-                    # Get each individual value
-                    bar_text = "{:.1f}".format(y[i][j])
-
-                    # Add the text
-                    ax.text(x_pos, y_pos, bar_text, fontsize='x-small', va=va,
-                            ha=ha, color=bar_color)
-
-                elif annotations == 'sum':
-                    # Only sum for last bar_set
-                    if i == len(bars_set)-1:
-                        # Calculate the sum of all bars at each bar
-                        bar_text = "$\Sigma$=" + \
-                            "{:.0f}".format(np.sum(y, 0)[j])
-
-                        # Add the text
-                        ax.text(x_pos, y_pos, bar_text, fontsize='x-small', va=va,
-                                ha=ha, color=bar_color)
-
-                elif annotations == '%':
-                    # Get max for xtick
-                    # bar_text =
-                    # Calc relative for each bar
-                    bar_text = "{:.0%}".format(y[i][j] / np.sum(y, 0)[j])
-
-                    # Add the text
-                    ax.text(x_pos, y_pos, bar_text, fontsize='x-small', va=va,
-                            ha=ha, color=bar_color)
-
-                else:
-                    print('Unknown option for annotation type')
+        values = plotData.missingAsNan(y)
+        totals = np.nansum(values, axis=0)
+
+        # Loop over datasets
+        for i, (cols, rects) in enumerate(bars_geometry):
+            if annotations == 'individual':
+                # Get each individual value
+                bar_text = np.char.mod("%.1f", values[i, cols])
+
+            elif annotations == 'sum':
+                # Only sum for last bar_set
+                if i < len(bars_geometry) - 1:
+                    continue
+                bar_text = np.char.add(r"$\Sigma$=", np.char.mod("%.0f", totals[cols]))
+
+            elif annotations == '%':
+                # Calc relative for each bar
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    bar_text = np.char.mod("%.0f%%", 100 * values[i, cols] / totals[cols])
+
+            else:
+                print('Unknown option for annotation type')
+                break
+
+            # Grab the color of bars so the text gets the same color
+            bar_color = bars_set[i][0].get_facecolor() if len(bars_set[i]) else None
+            plotAnnotations.barAnnotations(ax, rects, bar_text.tolist(), annotations_position,
+                                           color=bar_color, fit=annotations_fit)
 
     # Setting the x-ticks / y-ticks label of the axe-object
     if not (xticks is None):                # Position
@@ -363,17 +349,21 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
                     hText, rotation=0, rotation_mode='anchor',
                     horizontalalignment='left', verticalalignment='bottom',
                     fontsize='x-small')
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -384,17 +374,13 @@ def plotBarChart(y, *, xlabel=None, ylabel=None, title=None, legend=None,
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -755,6 +741,21 @@ def sample_grouped_empty(*, showPlt=True, fig=None, ax=None):
     return fig, ax
 
 
+def sample_many_bars(*, showPlt=True, fig=None, ax=None):
+    # Daily values of one year, labels which are wider than their bar
+    # are left out (annotations_fit)
+    rng = np.random.default_rng(0)
+    y = [rng.uniform(0, 10, 365), rng.uniform(0, 100, 365)]
+
+    plotBarChart(y, xlabel="Day", ylabel="Value", title="Many bars",
+                 legend=['Series 1', 'Series 2'], barChart='stacked',
+                 annotations='individual', annotations_position='center', annotations_fit=True,
+                 orientation='vertical', xlabelformat=None,
+                 mpl='_barchart_v', showPlt=showPlt, fig=fig, ax=ax)
+
+    return fig, ax
+
+
 if __name__ == "__main__":
     # sample_stacked()
     sample_grouped_none()
@@ -0,0 +1,997 @@
+# ------------------------------------------------------------------------------
+# Description:  Preparing data for the plotters (decimation of long series)
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Import functions / collections (from pyLEK.plotters import plotData)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import collections
+import hashlib
+
+import matplotlib
+import matplotlib.colors
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+# Samples processed at once, bounds the temporary memory of the decimation
+_chunkSize = 2**20
+
+# Available modes of decimate()
+decimationModes = ('minmax', 'lttb')
+
+
+def _isDataset(data):
+    # h5py.Dataset / zarr.Array alike: lazy arrays read by slicing
+    return (not isinstance(data, np.ndarray) and hasattr(data, 'shape') and
+            hasattr(data, 'dtype') and hasattr(data, '__getitem__'))
+
+
+def asArray(data, window=None):
+    """Input adapter of the plotters, array-likes are used w/o copies, the
+    window of the datapoints (last axis) is sliced before reading
+    - np.ndarray, np.memmap: view
+    - pandas.DataFrame: view w/ shape [n_columns, datapoints] (one series
+      per column, if all columns have the same dtype), pandas.Series: view
+    - h5py.Dataset and alike: only the window is read
+    - list / tuple: unchanged, or windowed per series
+    :param data: data to plot
+    :param window: slice w/ datapoints to plot, e.g. slice(0, 10**6, 10)
+    :rtype data: array or list
+    """
+    if data is None:
+        return None
+
+    if hasattr(data, 'to_numpy') and hasattr(data, 'columns'):
+        # DataFrame: columns are stored as rows of one block
+        data = data.to_numpy(copy=False).T
+    elif hasattr(data, 'to_numpy') and not isinstance(data, np.ndarray):
+        data = data.to_numpy(copy=False)
+    elif _isDataset(data):
+        index = (Ellipsis, window if not (window is None) else slice(None))
+        return data[index]
+
+    if isinstance(data, (list, tuple)):
+        # List of series, e.g. memmaps or columns of different lengths
+        if len(data) and np.ndim(data[0]) == 1:
+            return [asArray(series, window) for series in data]
+        return data if window is None else np.asarray(data)[..., window]
+
+    if window is None or np.ndim(data) == 0:
+        return data
+    return np.asarray(data)[..., window]
+
+
+def missingAsNan(y):
+    """Data w/ missing values (None) as float array w/ NaN
+    :param y: array w/ data, also object arrays w/ None
+    :rtype values: float array
+    """
+    y = np.asarray(y)
+    if y.dtype == object:
+        y = np.where(np.equal(y, None), np.nan, y)
+    return y.astype(float, copy=False)
+
+
+def splitSeries(x, y):
+    """Splits the data of plot2D into single series, columns of 2-D arrays
+    are returned as views
+    :param x: array w/ shape [datapoints] or [datapoints, n_row]
+    :param y: array w/ shape [datapoints] or [datapoints, n_row]
+    :rtype series: list w/ tuples (x, y) of 1-D arrays
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    nx = 1 if x.ndim == 1 else x.shape[1]
+    ny = 1 if y.ndim == 1 else y.shape[1]
+    n = max(nx, ny)
+
+    def column(a, i):
+        return a if a.ndim == 1 else a[:, i if a.shape[1] > 1 else 0]
+
+    return [(column(x, i), column(y, i)) for i in range(n)]
+
+
+def outputDpi(fig):
+    """Resolution of the saved figure, at least the one of the figure
+    :param fig: fig object
+    :rtype dpi: float w/ dots per inch
+    """
+    dpi = matplotlib.rcParams['savefig.dpi']
+    if not isinstance(dpi, (int, float)):
+        dpi = fig.dpi
+    return max(dpi, fig.dpi)
+
+
+def pixelWidth(ax, dpi=None):
+    """Width of an axe in pixels of the saved figure
+    :param ax: ax object
+    :param dpi: float w/ dots per inch, defaults to outputDpi
+    :rtype width: int w/ number of pixels
+    """
+    fig = ax.get_figure()
+    if dpi is None:
+        dpi = outputDpi(fig)
+    return max(1, int(ax.get_position().width * fig.get_figwidth() * dpi))
+
+
+def minMaxIndices(y, nBuckets):
+    """Indices of the min. and max. value in each of nBuckets buckets of
+    equal length, all peaks of y are kept
+    :param y: 1-D array w/ data
+    :param nBuckets: int w/ number of buckets, e.g. the pixel width
+    :rtype idx: array w/ sorted indices, first and last sample included
+    """
+    n = len(y)
+    if n <= 4 * nBuckets:
+        return np.arange(n)
+
+    k = n // nBuckets
+    indices = [np.array([0, n - 1])]
+
+    # Full buckets, processed in chunks
+    bucketsPerChunk = max(1, _chunkSize // k)
+    for first in range(0, nBuckets, bucketsPerChunk):
+        last = min(nBuckets, first + bucketsPerChunk)
+        block = y[first * k:last * k].reshape(last - first, k)
+
+        offsets = np.arange(first, last) * k
+
+        # NaN would be picked as min and max, one NaN per bucket is kept
+        # to keep the gap in the line
+        nan = np.isnan(block) if block.dtype.kind == 'f' else None
+        if nan is not None and nan.any():
+            lo = np.argmin(np.where(nan, np.inf, block), axis=1)
+            hi = np.argmax(np.where(nan, -np.inf, block), axis=1)
+            gaps = nan.any(axis=1)
+            indices.append(np.argmax(nan[gaps], axis=1) + offsets[gaps])
+        else:
+            lo = np.argmin(block, axis=1)
+            hi = np.argmax(block, axis=1)
+
+        indices += [lo + offsets, hi + offsets]
+
+    # Remaining samples
+    if nBuckets * k < n:
+        tail = y[nBuckets * k:]
+        if tail.dtype.kind == 'f' and np.isnan(tail).all():
+            indices.append(np.array([nBuckets * k]))
+        else:
+            indices.append(np.array([np.nanargmin(tail), np.nanargmax(tail)]) + nBuckets * k)
+
+    return np.unique(np.concatenate(indices))
+
+
+def lttbIndices(x, y, nOut):
+    """Indices of the points selected by Largest-Triangle-Three-Buckets
+    (Steinarsson 2013), keeps the visual shape w/ nOut points
+    :param x: 1-D array w/ data
+    :param y: 1-D array w/ data
+    :param nOut: int w/ number of points to keep
+    :rtype idx: array w/ sorted indices, first and last sample included
+    """
+    n = len(y)
+    if n <= nOut or nOut < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Buckets over the inner points, the last one holds the last sample
+    edges = np.linspace(1, n - 1, nOut - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    counts = np.diff(edges)
+
+    # Mean of each bucket, used as third point of the triangle
+    xMean = np.add.reduceat(x, edges[:-1]) / counts
+    yMean = np.add.reduceat(np.nan_to_num(y), edges[:-1]) / counts
+
+    idx = np.empty(nOut, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(nOut - 2):
+        start, end = edges[i], edges[i + 1]
+        xs, ys = x[start:end], y[start:end]
+
+        # Area of the triangles (a, candidate, mean of next bucket)
+        area = np.abs((x[a] - xMean[i + 1]) * (ys - y[a]) -
+                      (x[a] - xs) * (yMean[i + 1] - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        idx[i + 1] = a
+
+    return idx
+
+
+def decimate(x, y, nBuckets, mode='minmax'):
+    """Reduces a series to about the number of pixels it is drawn on
+    :param x: 1-D array w/ data
+    :param y: 1-D array w/ data
+    :param nBuckets: int w/ number of buckets, e.g. the pixel width
+    :param mode: string ('minmax', 'lttb'), minmax keeps all peaks and gaps
+                 (NaN), lttb keeps the shape, both return about 2 * nBuckets
+                 points
+    :rtype x: array w/ decimated data
+    :rtype y: array w/ decimated data
+    """
+    if mode == 'minmax':
+        idx = minMaxIndices(y, nBuckets)
+    elif mode == 'lttb':
+        idx = lttbIndices(x, y, 2 * nBuckets)
+    else:
+        raise ValueError("Unknown decimation mode '" + str(mode) + "', use one of: " +
+                         ", ".join(decimationModes))
+    return x[idx], y[idx]
+
+
+def _isSorted(x):
+    return len(x) < 2 or bool(np.all(x[1:] >= x[:-1]))
+
+
+def visibleData(x, y, xmin, xmax, isSorted=None):
+    """Samples within [xmin, xmax] incl. one sample on each side, sorted x
+    is sliced w/o copies
+    :param x: 1-D array w/ data
+    :param y: 1-D array w/ data
+    :param xmin: float w/ lower limit
+    :param xmax: float w/ upper limit
+    :param isSorted: bool true if x is ascending, checked if None
+    :rtype x: array w/ visible data
+    :rtype y: array w/ visible data
+    """
+    if isSorted is None:
+        isSorted = _isSorted(x)
+
+    if isSorted:
+        start = max(0, np.searchsorted(x, xmin, side='left') - 1)
+        end = min(len(x), np.searchsorted(x, xmax, side='right') + 1)
+        return x[start:end], y[start:end]
+
+    mask = (x >= xmin) & (x <= xmax)
+    return x[mask], y[mask]
+
+
+class DecimationUpdater:
+    """Decimates the series of lines again for the visible range whenever
+    the x-limits of the axe change, e.g. when zooming in the GUI
+    """
+
+    def __init__(self, ax, lines, series, mode='minmax'):
+        """
+        :param ax: ax object
+        :param lines: list w/ line objects
+        :param series: list w/ tuples (x, y) of the full data of each line
+        :param mode: string ('minmax', 'lttb')
+        """
+        self.ax = ax
+        self.lines = lines
+        self.series = series
+        self.mode = mode
+        self.isSorted = [_isSorted(x) for x, _ in series]
+
+        # Fixed, backends change the dpi of the figure while saving
+        self.dpi = outputDpi(ax.get_figure())
+        self.last = None
+        # Plain functions are kept by the callback registry, bound methods not
+        self.cid = ax.callbacks.connect('xlim_changed', lambda ax: self.update())
+
+    def update(self):
+        xmin, xmax = sorted(self.ax.get_xlim())
+        nBuckets = pixelWidth(self.ax, self.dpi)
+
+        # xlim_changed is also sent when autoscaling w/o a change
+        if self.last == (xmin, xmax, nBuckets):
+            return
+        self.last = (xmin, xmax, nBuckets)
+
+        for line, (x, y), isSorted in zip(self.lines, self.series, self.isSorted):
+            xs, ys = visibleData(x, y, xmin, xmax, isSorted)
+            line.set_data(*decimate(xs, ys, nBuckets, self.mode))
+
+        self.ax.figure.canvas.draw_idle()
+
+    def disconnect(self):
+        self.ax.callbacks.disconnect(self.cid)
+
+
+# Max. number of entries in the legend of a LineCollection
+maxLegendEntries = 20
+
+
+def lineSegments(x, y):
+    """Vertices of all series in one array, e.g. for a LineCollection
+    :param x: array w/ shape [datapoints] or [datapoints, n_row]
+    :param y: array w/ shape [datapoints] or [datapoints, n_row]
+    :rtype segments: array w/ shape [n_row, datapoints, 2]
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    if y.ndim == 1:
+        y = y[:, np.newaxis]
+
+    segments = np.empty((max(x.shape[1], y.shape[1]), len(y), 2))
+    segments[:, :, 0] = x.T
+    segments[:, :, 1] = y.T
+    return segments
+
+
+def cyclerStyles(customCycler, n):
+    """Line properties of n series as set by the cycler, as keyword arguments
+    of a LineCollection (color, linestyle, linewidth and alpha, the alpha is
+    applied to the colors as for a line). Other properties, e.g. marker, are
+    not supported by a LineCollection and left out
+    :param customCycler: cycler
+    :param n: int w/ number of series
+    :rtype styles: dict w/ colors (array w/ rgba-colors, shape [n, 4]),
+                   linestyles (list [n]) and linewidths (array [n])
+    """
+    from matplotlib.cbook import normalize_kwargs
+    from matplotlib.lines import Line2D
+
+    # Aliases (c, ls, lw) as full names
+    props = [normalize_kwargs(p, Line2D) for p in customCycler]
+    idx = np.arange(n) % len(props)
+    rc = matplotlib.rcParams
+
+    colors = np.array([matplotlib.colors.to_rgba(p.get('color', rc['lines.color']), p.get('alpha'))
+                       for p in props]).reshape(-1, 4)
+    styles = [p.get('linestyle', rc['lines.linestyle']) for p in props]
+    widths = np.array([p.get('linewidth', rc['lines.linewidth']) for p in props], dtype=float)
+    return {"colors": colors[idx], "linestyles": [styles[i] for i in idx],
+            "linewidths": widths[idx]}
+
+
+def lineCollection(x, y, customCycler, decimateMode=None, nBuckets=None):
+    """All series as one LineCollection, styled by the cycler (see cyclerStyles,
+    markers are not drawn)
+    :param x: array w/ shape [datapoints] or [datapoints, n_row], or
+              RaggedSeries (y is ignored)
+    :param y: array w/ shape [datapoints] or [datapoints, n_row]
+    :param customCycler: cycler w/ color / linestyle / linewidth / alpha
+    :param decimateMode: string ('minmax', 'lttb') to decimate each series
+    :param nBuckets: int w/ number of buckets for the decimation
+    :rtype lc: LineCollection
+    """
+    from matplotlib.collections import LineCollection
+
+    if isinstance(x, RaggedSeries):
+        segments = x.segments()
+    elif decimateMode is None:
+        segments = lineSegments(x, y)
+    else:
+        segments = [np.column_stack(decimate(xs, ys, nBuckets, decimateMode))
+                    for xs, ys in splitSeries(x, y)]
+
+    return LineCollection(segments, **cyclerStyles(customCycler, len(segments)))
+
+
+def collectionLegend(legend, customCycler, nSeries):
+    """Legend entries for the first series of a LineCollection, bounded by
+    maxLegendEntries
+    :param legend: list w/ legends [n]
+    :param customCycler: cycler of the LineCollection
+    :param nSeries: int w/ number of series in the LineCollection
+    :rtype handles: list w/ line objects
+    :rtype labels: list w/ strings
+    """
+    from matplotlib.lines import Line2D
+
+    n = min(len(legend), maxLegendEntries, nSeries)
+    styles = cyclerStyles(customCycler, n)
+
+    handles = [Line2D([], [], color=styles["colors"][i], linestyle=styles["linestyles"][i],
+                      linewidth=styles["linewidths"][i]) for i in range(n)]
+    labels = list(legend[:n])
+
+    if len(legend) > n:
+        handles.append(Line2D([], [], linestyle='None'))
+        labels.append("(+" + str(len(legend) - n) + " more)")
+    return handles, labels
+
+
+def isRagged(y):
+    """Checks for series of different lengths
+    :param y: list or 1-D object array w/ data to plot, with shape
+              [n_row, datapoints]
+    :rtype ragged: bool true if all series are sequences and differ in length
+    """
+    if isinstance(y, np.ndarray):
+        if y.dtype != object or y.ndim != 1:
+            return False
+    elif not isinstance(y, (list, tuple)):
+        return False
+    if len(y) < 2 or any(np.ndim(yi) != 1 for yi in y):
+        return False
+    lengths = np.fromiter(map(len, y), dtype=np.int64, count=len(y))
+    return bool(np.any(lengths != lengths[0]))
+
+
+def _multiRange(starts, lengths):
+    # Concatenated aranges [starts[i], starts[i] + lengths[i]) w/o a loop
+    total = int(lengths.sum())
+    shift = starts - np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.arange(total) + np.repeat(shift, lengths)
+
+
+class RaggedSeries:
+    """Series of different lengths packed into one contiguous buffer, the
+    samples of series i are values[offsets[i]:offsets[i + 1]]
+    """
+
+    def __init__(self, x, y):
+        """
+        :param x: list w/ one array per series or one array for all series
+                  (the first samples are used for shorter series)
+        :param y: list w/ one array per series, with different lengths
+        """
+        self.lengths = np.fromiter(map(len, y), dtype=np.int64, count=len(y))
+        self.offsets = np.zeros(len(y) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=self.offsets[1:])
+        self.y = np.concatenate(y).astype(float, copy=False)
+
+        if isRagged(x) or (isinstance(x, (list, tuple)) and np.ndim(x[0]) == 1
+                           and len(x) == len(y)):
+            self.x = np.concatenate(x).astype(float, copy=False)
+        else:
+            # Position of each sample within its series
+            position = np.arange(len(self.y)) - np.repeat(self.offsets[:-1], self.lengths)
+            self.x = np.asarray(x, dtype=float).ravel()[position]
+
+        if len(self.x) != len(self.y):
+            raise ValueError("x and y of the series differ in length")
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def segments(self):
+        """Vertices of each series, e.g. for a LineCollection
+        :rtype segments: list w/ arrays (views) of shape [datapoints, 2]
+        """
+        xy = np.column_stack((self.x, self.y))
+        return np.split(xy, self.offsets[1:-1])
+
+    def nanSeparated(self, first=0, step=1):
+        """Series first, first + step, ... joined to one path, separated by
+        NaN, e.g. for one line object
+        :param first: int w/ index of the first series
+        :param step: int w/ step between the series
+        :rtype x: array w/ data
+        :rtype y: array w/ data
+        """
+        series = np.arange(first, len(self), step)
+        lengths = self.lengths[series]
+        idx = _multiRange(self.offsets[series], lengths)
+
+        # One NaN after each series
+        out = np.arange(len(idx)) + np.repeat(np.arange(len(series)), lengths)
+        x = np.full(len(idx) + max(len(series) - 1, 0), np.nan)
+        y = x.copy()
+        x[out], y[out] = self.x[idx], self.y[idx]
+        return x, y
+
+
+# Modes of plotScatter binning the points instead of drawing markers
+densityModes = ('hexbin', 'hist2d', 'density')
+
+
+def chunks(data, window=None, chunkSize=_chunkSize):
+    """Reads a 1-D array-like piece by piece, memmaps and h5py datasets are
+    never loaded as a whole
+    :param data: array, memmap, h5py.Dataset, pandas Series or list
+    :param window: slice w/ datapoints to read, positive step
+    :param chunkSize: int w/ samples per chunk
+    :rtype chunk: generator of float arrays
+    """
+    if hasattr(data, 'to_numpy') and not isinstance(data, np.ndarray):
+        data = data.to_numpy(copy=False)
+    elif not (isinstance(data, np.ndarray) or _isDataset(data)):
+        data = np.asarray(data)
+
+    start, stop, step = (window or slice(None)).indices(len(data))
+    for begin in range(start, stop, chunkSize * step):
+        end = min(begin + chunkSize * step, stop)
+        yield np.asarray(data[begin:end:step], dtype=float)
+
+
+def dataExtent(x, y, window=None):
+    """Finite min. and max. of x and y in one pass over the chunks
+    :param x: array-like w/ data, see chunks
+    :param y: array-like w/ data, see chunks
+    :param window: slice w/ datapoints
+    :rtype extent: tuple w/ (xmin, xmax, ymin, ymax)
+    """
+    extent = np.array([np.inf, -np.inf, np.inf, -np.inf])
+    for xc, yc in zip(chunks(x, window), chunks(y, window)):
+        finite = np.isfinite(xc) & np.isfinite(yc)
+        if finite.any():
+            xc, yc = xc[finite], yc[finite]
+            extent = np.array([min(extent[0], xc.min()), max(extent[1], xc.max()),
+                               min(extent[2], yc.min()), max(extent[3], yc.max())])
+
+    if not np.all(np.isfinite(extent)):
+        return (0.0, 1.0, 0.0, 1.0)
+
+    # Constant data: a bin of width 1 around it
+    for i in (0, 2):
+        if extent[i] == extent[i + 1]:
+            extent[i], extent[i + 1] = extent[i] - 0.5, extent[i + 1] + 0.5
+    return tuple(extent)
+
+
+def histogram2d(x, y, bins=100, extent=None, window=None):
+    """2-D histogram, the points are binned chunk by chunk (see chunks), so
+    the data may be larger than the memory
+    :param x: array-like w/ data, see chunks
+    :param y: array-like w/ data, see chunks
+    :param bins: int or tuple w/ number of bins (nx, ny)
+    :param extent: tuple w/ (xmin, xmax, ymin, ymax), defaults to the data,
+                   points outside are not counted
+    :param window: slice w/ datapoints
+    :rtype counts: array w/ counts, shape [nx, ny]
+    :rtype xedges: array w/ bin edges, shape [nx + 1]
+    :rtype yedges: array w/ bin edges, shape [ny + 1]
+    """
+    nx, ny = (bins, bins) if np.ndim(bins) == 0 else bins
+    if extent is None:
+        extent = dataExtent(x, y, window)
+    xmin, xmax, ymin, ymax = extent
+
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for xc, yc in zip(chunks(x, window), chunks(y, window)):
+        # NaN fails all comparisons
+        inside = (xc >= xmin) & (xc <= xmax) & (yc >= ymin) & (yc <= ymax)
+        ix = ((xc[inside] - xmin) * (nx / (xmax - xmin))).astype(np.int64)
+        iy = ((yc[inside] - ymin) * (ny / (ymax - ymin))).astype(np.int64)
+        # Points on the upper edge belong to the last bin
+        np.minimum(ix, nx - 1, out=ix)
+        np.minimum(iy, ny - 1, out=iy)
+        counts += np.bincount(ix * ny + iy, minlength=nx * ny)
+
+    return (counts.reshape(nx, ny), np.linspace(xmin, xmax, nx + 1),
+            np.linspace(ymin, ymax, ny + 1))
+
+
+def hexbinCounts(x, y, gridsize=100, extent=None, window=None):
+    """Counts of the hexagons of ax.hexbin(gridsize=(nx, ny), extent=extent),
+    binned chunk by chunk (see chunks)
+    :param x: array-like w/ data, see chunks
+    :param y: array-like w/ data, see chunks
+    :param gridsize: int w/ number of hexagons in x-direction
+    :param extent: tuple w/ (xmin, xmax, ymin, ymax), defaults to the data
+    :param window: slice w/ datapoints
+    :rtype xc: array w/ x of the centers of all non-empty hexagons
+    :rtype yc: array w/ y of the centers
+    :rtype counts: array w/ counts
+    :rtype gridsize: tuple w/ (nx, ny) to pass to ax.hexbin
+    :rtype extent: tuple w/ (xmin, xmax, ymin, ymax) to pass to ax.hexbin
+    """
+    if extent is None:
+        extent = dataExtent(x, y, window)
+    xmin, xmax, ymin, ymax = extent
+    nx = int(gridsize)
+    ny = max(int(nx / np.sqrt(3)), 1)
+    sx, sy = (xmax - xmin) / nx, (ymax - ymin) / ny
+
+    # Two rectangular lattices, as in matplotlib.axes.Axes.hexbin
+    counts1 = np.zeros((nx + 1) * (ny + 1), dtype=np.int64)
+    counts2 = np.zeros(nx * ny, dtype=np.int64)
+    for xc, yc in zip(chunks(x, window), chunks(y, window)):
+        inside = (xc >= xmin) & (xc <= xmax) & (yc >= ymin) & (yc <= ymax)
+        ix, iy = (xc[inside] - xmin) / sx, (yc[inside] - ymin) / sy
+        ix1, iy1 = np.round(ix).astype(np.int64), np.round(iy).astype(np.int64)
+        ix2, iy2 = np.floor(ix).astype(np.int64), np.floor(iy).astype(np.int64)
+
+        onLattice1 = ((ix - ix1)**2 + 3.0 * (iy - iy1)**2 <
+                      (ix - ix2 - 0.5)**2 + 3.0 * (iy - iy2 - 0.5)**2)
+        counts1 += np.bincount(ix1[onLattice1] * (ny + 1) + iy1[onLattice1],
+                               minlength=len(counts1))[:len(counts1)]
+
+        # Points on the upper edge of lattice 2 are dropped by hexbin as well
+        off = ~onLattice1 & (ix2 < nx) & (iy2 < ny)
+        counts2 += np.bincount(ix2[off] * ny + iy2[off], minlength=len(counts2))
+
+    i1, j1 = np.divmod(np.arange(len(counts1)), ny + 1)
+    i2, j2 = np.divmod(np.arange(len(counts2)), ny)
+    xc = np.concatenate((xmin + sx * i1, xmin + sx * (i2 + 0.5)))
+    yc = np.concatenate((ymin + sy * j1, ymin + sy * (j2 + 0.5)))
+    counts = np.concatenate((counts1, counts2))
+
+    nonEmpty = counts > 0
+    return xc[nonEmpty], yc[nonEmpty], counts[nonEmpty], (nx, ny), extent
+
+
+def smoothDensity(counts, xedges, yedges):
+    """Probability density from a 2-D histogram, smoothed with a Gaussian
+    kernel (bandwidth acc. to Scott's rule)
+    :param counts: array w/ counts, shape [nx, ny]
+    :param xedges: array w/ bin edges, shape [nx + 1]
+    :param yedges: array w/ bin edges, shape [ny + 1]
+    :rtype density: array w/ density, shape [nx, ny]
+    """
+    n = counts.sum()
+    if n == 0:
+        return np.zeros(counts.shape)
+
+    def kernel(marginal):
+        # Bandwidth in bins from the std. of the marginal distribution
+        centers = np.arange(len(marginal))
+        mean = np.dot(centers, marginal) / n
+        std = np.sqrt(np.dot((centers - mean)**2, marginal) / n)
+        sigma = max(std * n**(-1.0 / 6.0), 0.5)
+        K = np.exp(-0.5 * ((centers[:, None] - centers[None, :]) / sigma)**2)
+        return K / K.sum(axis=0)
+
+    Kx = kernel(counts.sum(axis=1))
+    Ky = kernel(counts.sum(axis=0))
+    density = Kx @ counts @ Ky.T
+
+    area = np.diff(xedges)[:, None] * np.diff(yedges)[None, :]
+    return density / (density.sum() * area)
+
+
+def densityColormap(customCycler, fromWhite=False):
+    """Colormap from (nearly) white to the first color of the cycler
+    :param customCycler: cycler w/ color
+    :param fromWhite: bool true to start at white, otherwise at a light tint
+                      so that bins w/ few points remain visible
+    :rtype cmap: colormap object
+    """
+    color = cyclerStyles(customCycler, 1)["colors"][0]
+    light = np.array([1.0, 1.0, 1.0, 1.0]) if fromWhite else 0.85 + 0.15 * color
+    return matplotlib.colors.LinearSegmentedColormap.from_list('pyLEK_density', [light, color])
+
+
+# Size of the cells of a surface w/ level of detail, in pixels of the saved figure
+pixelsPerCell = 8
+
+
+def blockAverage(a, factors):
+    """Mean of blocks of factors[i] samples along each axis, the last block
+    of an axis may be smaller. Only the reduced array is allocated, memmaps
+    are read once
+    :param a: array w/ data
+    :param factors: tuple w/ int per axis, 1 to keep the axis
+    :rtype mean: array w/ shape [ceil(a.shape[i] / factors[i])]
+    """
+    a = np.asarray(a)
+    for axis, factor in enumerate(factors):
+        if factor <= 1:
+            continue
+        starts = np.arange(0, a.shape[axis], factor)
+        counts = np.diff(np.append(starts, a.shape[axis]))
+        shape = [1] * a.ndim
+        shape[axis] = -1
+        a = np.add.reduceat(a, starts, axis=axis, dtype=float) / counts.reshape(shape)
+    return a
+
+
+def gridCells(ax):
+    """Number of cells per direction a surface on the axe is resolved with
+    :param ax: ax object
+    :rtype cells: int w/ size of the axe in pixels / pixelsPerCell
+    """
+    fig = ax.get_figure()
+    position = ax.get_position()
+    pixels = outputDpi(fig) * max(position.width * fig.get_figwidth(),
+                                  position.height * fig.get_figheight())
+    return max(int(pixels / pixelsPerCell), 2)
+
+
+def lodFactors(ax, shape, maxCells=None):
+    """Block sizes to reduce a grid to about the resolution it is drawn with
+    :param ax: ax object
+    :param shape: tuple w/ shape of the grid [rows, columns]
+    :param maxCells: int w/ max. number of cells per direction, defaults to
+                     gridCells
+    :rtype factors: tuple w/ (rowFactor, columnFactor)
+    """
+    maxCells = gridCells(ax) if maxCells is None else max(int(maxCells), 2)
+    return tuple(max(1, int(np.ceil(n / maxCells))) for n in shape)
+
+
+def surfaceField(z, factors=(1, 1)):
+    """Field of a surface plot reduced by blockAverage
+    :param z: array w/ shape [datapoints] (the field is z[i] * z[j]) or
+              [rows, columns]
+    :param factors: tuple w/ (rowFactor, columnFactor)
+    :rtype Z: array w/ shape [rows, columns]
+    """
+    if np.ndim(z) == 1:
+        # Mean of a block of z[i] * z[j] equals the product of the means
+        return np.outer(blockAverage(z, factors[:1]), blockAverage(z, factors[1:]))
+    return blockAverage(z, factors)
+
+
+def surfaceGrid(ax, x, y, z, lod=True):
+    """Grid of a surface plot w/o copies, 1-D x / y are broadcasted to the
+    shape of Z, large grids are averaged in blocks (level of detail)
+    :param ax: ax object the surface is drawn on
+    :param x: array w/ shape [columns] or [rows, columns]
+    :param y: array w/ shape [rows] or [rows, columns]
+    :param z: array w/ shape [datapoints] or [rows, columns], see surfaceField
+    :param lod: bool true to reduce to the resolution of the axe, int w/ max.
+                cells per direction, false to keep the grid
+    :rtype X: array w/ shape [rows, columns]
+    :rtype Y: array w/ shape [rows, columns]
+    :rtype Z: array w/ shape [rows, columns]
+    :rtype factors: tuple w/ (rowFactor, columnFactor), e.g. for further fields
+    """
+    x, y, z = asArray(x), asArray(y), asArray(z)
+    shape = (len(z), len(z)) if np.ndim(z) == 1 else np.shape(z)
+
+    factors = lodFactors(ax, shape, None if lod is True else lod) if lod else (1, 1)
+    Z = surfaceField(z, factors)
+
+    if np.ndim(x) == 1:
+        X = np.broadcast_to(blockAverage(x, factors[1:]), Z.shape)
+    else:
+        X = blockAverage(x, factors)
+    if np.ndim(y) == 1:
+        Y = np.broadcast_to(blockAverage(y, factors[:1])[:, None], Z.shape)
+    else:
+        Y = blockAverage(y, factors)
+    return X, Y, Z, factors
+
+
+# Triangulations of the latest (x, y) layouts {key: Triangulation}, most
+# recently used last
+_triangulations = collections.OrderedDict()
+
+# Max. number of cached triangulations
+maxTriangulations = 32
+
+
+def triangulationKey(x, y):
+    """Hash of a point layout
+    :param x: array w/ x of the points
+    :param y: array w/ y of the points
+    :rtype key: string w/ sha256 hexdigest
+    """
+    h = hashlib.sha256()
+    for a in (x, y):
+        a = np.ascontiguousarray(a, dtype=float)
+        h.update(repr(a.shape).encode())
+        h.update(a)
+    return h.hexdigest()
+
+
+def triangulation(x, y):
+    """Delaunay triangulation of a point layout, computed once and reused
+    for the same (x, y), e.g. for many time steps of z on the same sensors.
+    The least recently used ones are dropped beyond maxTriangulations
+    :param x: array w/ x of the points
+    :param y: array w/ y of the points
+    :rtype tri: matplotlib.tri.Triangulation
+    """
+    from matplotlib.tri import Triangulation
+
+    key = triangulationKey(x, y)
+    tri = _triangulations.get(key)
+    if tri is None:
+        tri = Triangulation(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        _triangulations[key] = tri
+        while len(_triangulations) > maxTriangulations:
+            _triangulations.popitem(last=False)
+    else:
+        _triangulations.move_to_end(key)
+    return tri
+
+
+def clearTriangulations():
+    """Removes all cached triangulations
+    """
+    _triangulations.clear()
+    _interpolators.clear()
+
+
+# Methods of GridInterpolator
+interpolationMethods = ('linear', 'nearest', 'cubic')
+
+
+class GridInterpolator:
+    """Interpolation of scattered node results (e.g. FE nodes) onto regular
+    grids. The triangulation / tree of the nodes is built once, the weights
+    of each grid are computed once, so many fields are only re-mapped
+    """
+
+    def __init__(self, x, y, method='linear'):
+        """
+        :param x: array w/ x of the nodes
+        :param y: array w/ y of the nodes
+        :param method: string ('linear', 'nearest', 'cubic'), cubic uses
+                       Clough-Tocher, linear and cubic are NaN outside of the
+                       convex hull of the nodes
+        """
+        if not (method in interpolationMethods):
+            raise ValueError("Unknown method '" + str(method) + "', use one of: " +
+                             ", ".join(interpolationMethods))
+        self.method = method
+        self.points = np.column_stack((np.asarray(x, dtype=float).ravel(),
+                                       np.asarray(y, dtype=float).ravel()))
+
+        if method == 'nearest':
+            from scipy.spatial import cKDTree
+            self.tree = cKDTree(self.points)
+        else:
+            from scipy.spatial import Delaunay
+            self.delaunay = Delaunay(self.points)
+
+        # Weights of the latest grid {(xmin, xmax, ymin, ymax, rows, columns): ...}
+        self._weights = {}
+
+    def grid(self, shape, extent=None):
+        """Regular grid over the nodes
+        :param shape: tuple w/ (rows, columns)
+        :param extent: tuple w/ (xmin, xmax, ymin, ymax), defaults to the nodes
+        :rtype xg: array w/ x of the columns
+        :rtype yg: array w/ y of the rows
+        """
+        if extent is None:
+            (xmin, ymin), (xmax, ymax) = self.points.min(axis=0), self.points.max(axis=0)
+            extent = (xmin, xmax, ymin, ymax)
+        return (np.linspace(extent[0], extent[1], shape[1]),
+                np.linspace(extent[2], extent[3], shape[0]))
+
+    def _gridWeights(self, xg, yg):
+        key = (xg[0], xg[-1], yg[0], yg[-1], len(yg), len(xg))
+        weights = self._weights.get(key)
+        if weights is None:
+            X, Y = np.meshgrid(xg, yg)
+            points = np.column_stack((X.ravel(), Y.ravel()))
+
+            if self.method == 'nearest':
+                weights = self.tree.query(points)[1]
+            elif self.method == 'linear':
+                # Barycentric coordinates in the enclosing triangle
+                simplex = self.delaunay.find_simplex(points)
+                T = self.delaunay.transform[simplex]
+                b = np.einsum('ijk,ik->ij', T[:, :2], points - T[:, 2])
+                w = np.column_stack((b, 1.0 - b.sum(axis=1)))
+                w[simplex < 0] = np.nan
+                weights = (self.delaunay.simplices[simplex], w)
+            else:
+                # Clough-Tocher depends on the field, only the points are kept
+                weights = points
+
+            self._weights = {key: weights}
+        return weights
+
+    def __call__(self, values, xg, yg):
+        """Fields on the grid
+        :param values: array w/ node values, shape [nodes] or [fields, nodes]
+        :param xg: array w/ x of the columns, see grid
+        :param yg: array w/ y of the rows, see grid
+        :rtype fields: array w/ shape [rows, columns] or [fields, rows, columns]
+        """
+        values = np.asarray(values, dtype=float)
+        single = values.ndim == 1
+        values = values.reshape(-1, len(self.points))
+        weights = self._gridWeights(xg, yg)
+
+        if self.method == 'nearest':
+            out = values[:, weights]
+        elif self.method == 'linear':
+            vertices, w = weights
+            out = np.empty((len(values), len(w)))
+            # Fields in batches, bounds the temporary [fields, points, 3]
+            batch = max(1, _chunkSize // (3 * len(w)))
+            for first in range(0, len(values), batch):
+                block = values[first:first + batch]
+                out[first:first + batch] = np.einsum('fij,ij->fi', block[:, vertices], w)
+        else:
+            from scipy.interpolate import CloughTocher2DInterpolator
+            out = CloughTocher2DInterpolator(self.delaunay, values.T)(weights).T
+
+        out = out.reshape(len(values), len(yg), len(xg))
+        return out[0] if single else out
+
+
+# Interpolators of the latest node layouts {(key, method): GridInterpolator}
+_interpolators = collections.OrderedDict()
+
+
+def interpolator(x, y, method='linear'):
+    """GridInterpolator of a node layout, built once and reused for the same
+    (x, y), cached like triangulation
+    :param x: array w/ x of the nodes
+    :param y: array w/ y of the nodes
+    :param method: string ('linear', 'nearest', 'cubic')
+    :rtype interpolator: GridInterpolator
+    """
+    key = (triangulationKey(x, y), method)
+    interp = _interpolators.get(key)
+    if interp is None:
+        interp = GridInterpolator(x, y, method)
+        _interpolators[key] = interp
+        while len(_interpolators) > maxTriangulations:
+            _interpolators.popitem(last=False)
+    else:
+        _interpolators.move_to_end(key)
+    return interp
+
+
+def interpolateNodes(ax, x, y, fields, method='linear', cells=None):
+    """Scattered node results on a grid w/ the resolution of the axe
+    :param ax: ax object the fields are drawn on
+    :param x: array w/ x of the nodes
+    :param y: array w/ y of the nodes
+    :param fields: array w/ node values, shape [nodes] or [fields, nodes]
+    :param method: string ('linear', 'nearest', 'cubic')
+    :param cells: int w/ cells per direction, defaults to gridCells
+    :rtype xg: array w/ x of the columns
+    :rtype yg: array w/ y of the rows
+    :rtype fields: array w/ shape [rows, columns] or [fields, rows, columns]
+    """
+    interp = interpolator(x, y, method)
+    if cells is None:
+        cells = gridCells(ax)
+    xg, yg = interp.grid((cells, cells))
+    return xg, yg, interp(fields, xg, yg)
+
+
+# Lookup tables of the colormaps {(name, N): (cmap, lut)}
+_luts = {}
+
+
+def colormapLut(cmap, N=255):
+    """RGBA-colors of a colormap as uint8, cached per colormap. The entry N
+    holds the color for NaN (bad)
+    :param cmap: colormap object
+    :param N: int w/ number of colors, at most 255 for uint8 indices
+    :rtype lut: array w/ shape [N + 1, 4], dtype uint8
+    """
+    key = (cmap.name, N)
+    cached = _luts.get(key)
+    if cached is None or not (cached[0] == cmap):
+        rgba = np.vstack((cmap(np.linspace(0.0, 1.0, N)), cmap(np.nan)))
+        cached = (cmap, np.round(rgba * 255).astype(np.uint8))
+        _luts[key] = cached
+    return cached[1]
+
+
+def lutIndices(c, vmin, vmax, N=255):
+    """Indices of the values in a LUT of colormapLut, chunk by chunk
+    :param c: array w/ values
+    :param vmin: float w/ value of the first color
+    :param vmax: float w/ value of the last color
+    :param N: int w/ number of colors of the LUT
+    :rtype idx: array w/ shape of c, dtype uint8 (uint16 for N > 255)
+    """
+    c = np.asarray(c)
+    idx = np.empty(c.shape, dtype=np.uint8 if N < 256 else np.uint16)
+    scale = (N - 1) / (vmax - vmin) if vmax > vmin else 0.0
+
+    flatC, flatIdx = c.reshape(-1), idx.reshape(-1)
+    for start in range(0, flatC.size, _chunkSize):
+        block = flatC[start:start + _chunkSize]
+        scaled = np.clip((block - vmin) * scale + 0.5, 0, N - 1)
+        scaled[np.isnan(block)] = N
+        flatIdx[start:start + _chunkSize] = scaled
+    return idx
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def sample():
+    import time
+
+    # 10 million samples w/ single spikes
+    n = 10**7
+    x = np.linspace(0, 100, n)
+    y = np.sin(x) + 0.1 * np.random.default_rng(0).standard_normal(n)
+    y[[1234567, 7654321]] = [5.0, -5.0]
+
+    for mode in decimationModes:
+        start = time.perf_counter()
+        xd, yd = decimate(x, y, 1000, mode)
+        print(mode + ": " + str(len(xd)) + " points in %.3f s, max %.1f, min %.1f"
+              % (time.perf_counter() - start, yd.max(), yd.min()))
+
+
+if __name__ == "__main__":
+    sample()
@@ -7,8 +7,19 @@
 # ------------------------------------------------------------------------------
 # Libraries
 # ------------------------------------------------------------------------------
+import concurrent.futures
+import contextlib
+import functools
+import matplotlib
+import numpy as np
 import subprocess
 import os
+import pickle
+import queue
+import shutil
+import tempfile
+import threading
+import time
 # ----------------------------------------------------------------------
 # Imported functions
 # ----------------------------------------------------------------------
@@ -42,74 +53,850 @@ def calcFigSize(numberOfFigures=1, aspectRatio=3/2, pageWidth=21,
     return figSize
 
 
-def savePdf_tex(fig, dir_fileName, **kwargs):
-    """ Exporting a figure to .pdf_tex via command line interface
-    :param fig: fig object to be saved 
-    :param dir_fileName: string w/ Directory / Filename to save to,  
-                         must be specified when savePlt is specified
+# Held while a plotter creates and saves its figure: the rcParams of
+# matplotlib are global to the process (also read when saving), so styles of
+# plotters in different threads would mix otherwise
+renderLock = threading.RLock()
+
+# Jobs to run once the outermost plotter of a thread has returned
+_pendingJobs = threading.local()
+
+
+def threadSafe(plotter):
+    """Decorator for the plotters, runs them under renderLock within an
+    rc_context, so the style of a plot does not leak into other plots.
+    Jobs w/o access to the style (showing the figure, the Inkscape export)
+    run after renderLock is released, they do not block plotters in other
+    threads
+    :param plotter: plotter function
+    """
+    @functools.wraps(plotter)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_pendingJobs, 'jobs', None) is None
+        if outer:
+            _pendingJobs.jobs = []
+        try:
+            with renderLock, matplotlib.rc_context():
+                result = plotter(*args, **kwargs)
+            jobs = _pendingJobs.jobs if outer else []
+        finally:
+            if outer:
+                _pendingJobs.jobs = None
+
+        for job in jobs:
+            job()
+        return result
+
+    return wrapper
+
+
+def afterRender(job):
+    """Runs a job once renderLock is released, i.e. after the outermost
+    plotter of the thread has returned (immediately outside of a plotter)
+    :param job: function w/o arguments
+    """
+    jobs = getattr(_pendingJobs, 'jobs', None)
+    if jobs is None:
+        job()
+    else:
+        jobs.append(job)
+
+
+def showFigure(fig, close=False):
+    """Shows the pyplot figures, within a plotter not before renderLock is
+    released
+    :param fig: figure object to be shown
+    :param close: bool true to close the figure after showing it
+    """
+    import matplotlib.pyplot as plt
+
+    def show():
+        plt.show()
+        if close:
+            plt.close(fig)
+
+    afterRender(show)
+
+
+def newFigure(*, projection=None, pyplot=False):
+    """An empty figure with one axe, created w/o pyplot unless it is needed to
+    show the figure. The savefig-settings of the active style are kept with
+    the figure for saveFigure
+    :param projection: string w/ projection of the axe, e.g. '3d'
+    :param pyplot: bool true to register the figure with pyplot
+    :rtype fig: figure object
+    :rtype ax: axe object
+    """
+    if pyplot:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+    else:
+        from matplotlib.figure import Figure
+        fig = Figure()
+    ax = fig.add_subplot(projection=projection)
+
+    fig._pyLEK_savefig = {key: value for key, value in matplotlib.rcParams.items()
+                          if key.startswith('savefig.')}
+    return fig, ax
+
+
+# Paths written by the save helpers while recorded, per thread
+_writtenFiles = threading.local()
+
+
+@contextlib.contextmanager
+def recordWrittenFiles():
+    """Collects the paths written by saveFigure, savePickle and savePdf_tex
+    within the with-block, e.g. to cache exactly the files of a plotter
+    :rtype files: list w/ paths, filled while the block runs
+    """
+    outer = getattr(_writtenFiles, 'files', None)
+    files = _writtenFiles.files = []
+    try:
+        yield files
+    finally:
+        _writtenFiles.files = outer
+        if outer is not None:
+            outer.extend(files)
+
+
+def _recordWritten(*paths):
+    files = getattr(_writtenFiles, 'files', None)
+    if files is not None:
+        files.extend(os.fspath(path) for path in paths)
+
+
+def saveFigure(fig, fname, **kwargs):
+    """Saves a figure w/ the savefig-settings (format, dpi, bbox, ...) of the
+    style it was created with, e.g. a figure returned by a plotter w/ keepFig
+    :param fig: fig object to be saved
+    :param fname: string w/ Directory / Filename, w/o extension the format
+                  of the style is used
+    :param kwargs: further arguments of fig.savefig
+    :rtype path: string w/ path of the saved file
+    """
+    with matplotlib.rc_context(getattr(fig, '_pyLEK_savefig', {})):
+        fig.savefig(fname, **kwargs)
+        fileFormat = matplotlib.rcParams['savefig.format']
+
+    if not isinstance(fname, (str, os.PathLike)):
+        # File object
+        return None
+
+    # Extension appended by matplotlib, as in FigureCanvasBase.print_figure
+    path = os.fspath(fname)
+    if kwargs.get('format') is None and not os.path.splitext(path)[1][1:]:
+        path = path.rstrip('.') + '.' + fileFormat
+
+    _recordWritten(path)
+    return path
+
+
+def savePickle(ax, dir_fileName):
+    """Saves an axe as .pickle, to be loaded again e.g. by mergePicklePlots
+    :param ax: ax object to be saved
+    :param dir_fileName: string w/ Directory / Filename to save to
+    :rtype path: string w/ path of the saved file
+    """
+    path = dir_fileName + ".pickle"
+    with open(path, "wb") as file:
+        pickle.dump(ax, file)
+
+    _recordWritten(path)
+    return path
+
+
+def getColormap(name):
+    """Colormap by name, seaborn is only imported for its own colormaps
+    (e.g. 'crest', 'rocket'), matplotlib colormaps are used directly
+    :param name: string w/ name of the colormap
+    :rtype cmap: colormap object
     """
-    # Save as.pdf
-    fig.savefig("temp.pdf", format="pdf", **kwargs)
+    try:
+        return matplotlib.colormaps[name]
+    except KeyError:
+        import seaborn as sns
+        return sns.color_palette(name, as_cmap=True)
+
 
+# Default for rasterize=True of the plotters: artists w/ more vertices / points
+rasterizeThreshold = 5000
+
+
+def vertexCount(artist):
+    """Number of vertices an artist writes to a vector file
+    :param artist: Line2D or Collection (scatter, LineCollection, surfaces)
+    :rtype count: int
+    """
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata(orig=False))
+    if isinstance(artist, Collection):
+        vertices = sum(len(path.vertices) for path in artist.get_paths())
+        if not vertices and hasattr(artist, 'do_3d_projection'):
+            vertices = _vertexCount3D(artist)
+        # Scatter: one marker path drawn at every offset
+        return max(vertices, len(artist.get_offsets()))
+    return 0
+
+
+def _vertexCount3D(artist):
+    """Vertices of a mplot3d collection before it is drawn, its 2-D paths are
+    projected only when drawing. mplot3d has no public access to the 3-D
+    vertices, the internal ones are read if present (0 otherwise)
+    :param artist: e.g. Poly3DCollection
+    :rtype count: int
+    """
+    try:
+        faces = getattr(artist, '_faces', None)
+        if faces is not None and np.ndim(faces) == 3:
+            # [faces, vertices per face, 3]
+            return int(np.prod(np.shape(faces)[:2]))
+        vec = getattr(artist, '_vec', None)
+        if vec is not None and np.ndim(vec) == 2:
+            # [4, vertices], homogeneous coordinates
+            return int(np.shape(vec)[1])
+    except (TypeError, ValueError):
+        pass
+    return 0
+
+
+def rasterizeDense(fig, maxVertices=None):
+    """Rasterizes lines and collections w/ more than maxVertices vertices at
+    savefig.dpi when saving to .pdf / .svg, axes, labels and texts stay vector
+    :param fig: figure object
+    :param maxVertices: int w/ max. vertices of a vector artist, defaults to
+                        rasterizeThreshold
+    :rtype count: int w/ number of rasterized artists
+    """
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+
+    if maxVertices is None or maxVertices is True:
+        maxVertices = rasterizeThreshold
+
+    count = 0
+    for ax in fig.axes:
+        for artist in ax.get_children():
+            if not isinstance(artist, (Line2D, Collection)):
+                continue
+            if vertexCount(artist) > maxVertices:
+                artist.set_rasterized(True)
+                count += 1
+
+    return count
+
+
+def _inkscapeCommand(inFile, dir_fileName, inkscape='inkscape'):
+    """Command line call of Inkscape to convert a .pdf to .pdf + .pdf_tex
+    :param inFile: string w/ path of the .pdf to convert
+    :param dir_fileName: string w/ Directory / Filename to save to
+    :rtype incmd: list w/ command line arguments
+    """
     # Windows
     if os.name == 'nt':
-        incmd = ["inkscape", "temp.pdf", "--export-type=pdf",
+        incmd = [inkscape, inFile, "--export-type=pdf",
                  "--export-filename={}.pdf".format(dir_fileName),
                  "--export-latex"]
 
     # Linux
     # Shell command to be called
-    elif os.name == 'posix':
-        incmd = ["inkscape", "temp.pdf", "-export-type=pdf",
+    else:
+        incmd = [inkscape, inFile, "-export-type=pdf",
                  "-export-filename={}.pdf".format(dir_fileName),
                  "-export-latex"]
 
+    return incmd
+
+
+def _tempPdf(fig, **kwargs):
+    """Saves a figure to a unique temporary .pdf
+    :param fig: fig object to be saved
+    :rtype tempPath: string w/ path of the temporary file
+    """
+    fd, tempPath = tempfile.mkstemp(prefix='pyLEK_', suffix='.pdf')
+    os.close(fd)
+
+    try:
+        fig.savefig(tempPath, format="pdf", **kwargs)
+    except Exception:
+        os.remove(tempPath)
+        raise
+
+    return tempPath
+
+
+def savePdf_tex(fig, dir_fileName, engine=None, **kwargs):
+    """ Exporting a figure to .pdf_tex via command line interface. Within a
+    "with PdfTexExporter():" block the export is queued instead.
+    :param fig: fig object to be saved 
+    :param dir_fileName: string w/ Directory / Filename to save to,  
+                         must be specified when savePlt is specified
+    :param engine: string ('inkscape', 'native', 'pgf') or None to use
+                   Inkscape if installed and 'native' otherwise
+    """
+    if dir_fileName is None:
+        raise TypeError("dir_fileName must be specified")
+
+    if engine is None:
+        engine = 'inkscape' if _inkscapeInstalled() else 'native'
+
+    if engine == 'native':
+        return savePdf_texNative(fig, dir_fileName, **kwargs)
+    elif engine == 'pgf':
+        return savePgf(fig, dir_fileName, **kwargs)
+
+    # Queue in the active exporter
+    exporter = _activeExporter()
+    if exporter is not None:
+        return exporter.submit(fig, dir_fileName, **kwargs)
+
+    # Save as unique .pdf, parallel exports do not overwrite each other
+    tempPath = _tempPdf(fig, **kwargs)
+
+    # Inkscape runs w/o renderLock, plotters in other threads go on meanwhile
+    afterRender(functools.partial(_inkscapeExport, tempPath, dir_fileName))
+
+
+def _inkscapeExport(tempPath, dir_fileName):
+    """Converts a temporary .pdf to .pdf + .pdf_tex w/ Inkscape and removes it
+    :param tempPath: string w/ path of the temporary .pdf
+    :param dir_fileName: string w/ Directory / Filename to save to
+    """
     # Open shell to export
     try:
-        subprocess.check_output(incmd)
+        subprocess.check_output(_inkscapeCommand(tempPath, dir_fileName))
+        _recordWritten(dir_fileName + ".pdf", dir_fileName + ".pdf_tex")
     except FileNotFoundError as e:
         print('FileNotFoundError: ' + e.strerror)
         print("Failed to save as .pdf_tex.\nIs a recent version of Inkscape installed? \nInkscape is required to use the plot2D saveTex functionality.")
+    finally:
+        # Clean up .pdf
+        os.remove(tempPath)
 
-    # Clean up .pdf
-    os.remove("temp.pdf")
 
+_inkscapeFound = None
 
-def fontChecker():
-    import matplotlib.pyplot as plt
 
-    # Rebuild font
+def _inkscapeInstalled():
+    # Looked up once per process
+    global _inkscapeFound
+    if _inkscapeFound is None:
+        _inkscapeFound = shutil.which('inkscape') is not None
+        if not _inkscapeFound:
+            print("Inkscape not found, .pdf_tex is exported w/o Inkscape")
+    return _inkscapeFound
+
+
+_pdfTexHeader = r"""%% Creator: pyLEK (matplotlib {version})
+%% Accompanies image file '{name}.pdf' (pdf)
+%%
+%% To include the image in your LaTeX document, write
+%%   \input{{<filename>.pdf_tex}}
+%%  instead of
+%%   \includegraphics{{<filename>.pdf}}
+%% To scale the image, write
+%%   \def\svgwidth{{<desired width>}}
+%%   \input{{<filename>.pdf_tex}}
+%%  instead of
+%%   \includegraphics[width=<desired width>]{{<filename>.pdf}}
+%%
+\begingroup%
+  \makeatletter%
+  \providecommand\color[2][]{{%
+    \errmessage{{(pyLEK) Color is used for the text, but the package 'color.sty' is not loaded}}%
+    \renewcommand\color[2][]{{}}%
+  }}%
+  \providecommand\rotatebox[2]{{#2}}%
+  \newcommand*\fsize{{\dimexpr\f@size pt\relax}}%
+  \newcommand*\lineheight[1]{{\fontsize{{\fsize}}{{#1\fsize}}\selectfont}}%
+  \ifx\svgwidth\undefined%
+    \setlength{{\unitlength}}{{{width:.4f}bp}}%
+    \ifx\svgscale\undefined%
+      \relax%
+    \else%
+      \setlength{{\unitlength}}{{\unitlength * \real{{\svgscale}}}}%
+    \fi%
+  \else%
+    \setlength{{\unitlength}}{{\svgwidth}}%
+  \fi%
+  \global\let\svgwidth\undefined%
+  \global\let\svgscale\undefined%
+  \makeatother%
+  \begin{{picture}}(1,{ratio:.8f})%
+    \lineheight{{1}}%
+    \setlength\tabcolsep{{0pt}}%
+    \put(0,0){{\includegraphics[width=\unitlength,page=1]{{{name}.pdf}}}}%
+"""
+
+_pdfTexFooter = r"""  \end{picture}%
+\endgroup%
+"""
+
+
+def _latexText(text):
+    """Text of a matplotlib text artist as LaTeX, as written by Inkscape:
+    the text is passed to LaTeX as it is shown by matplotlib, i.e. escaped
+    dollars (\\$\\sin x\\$) delimit math in LaTeX, everything else is raw
+    LaTeX code
+    :param text: string w/ text of the artist
+    :rtype text: string for the LaTeX picture
+    """
+    return text.replace('\u2212', '-').replace('\\$', '$')
+
+
+def _textOverlay(text, bbox, renderer):
+    """LaTeX-command placing one text artist of the figure
+    :param text: matplotlib.text.Text
+    :param bbox: Bbox in inches of the exported figure region
+    :rtype put: string w/ LaTeX put-command
+    """
+    extent = text.get_window_extent(renderer)
+    dpi = renderer.dpi
+    x0, x1 = extent.x0 / dpi, extent.x1 / dpi
+    y0, y1 = extent.y0 / dpi, extent.y1 / dpi
+
+    rotation = text.get_rotation() % 360
+    r, g, b, _ = matplotlib.colors.to_rgba(text.get_color())
+    content = r"\smash{{\begin{{tabular}}[t]{{{align}}}{lines}\end{{tabular}}}}"
+
+    # \smash'ed text sits w/ the baseline of its first line on the point
+    lines = _latexText(text.get_text()).split('\n')
+    _, h, d = renderer.get_text_width_height_descent(
+        text.get_text().split('\n')[0], text.get_fontproperties(), ismath=False)
+    h, d = h / dpi, d / dpi
+
+    if rotation == 0:
+        # Keep horizontal alignment, LaTeX text may be longer / shorter
+        ha = text.get_horizontalalignment()
+        x, halign = {'left': (x0, 'l'), 'right': (x1, 'r')}.get(ha, ((x0 + x1) / 2, ''))
+        y = y1 - (h - d)
+        align = halign or 'c'
+    else:
+        # Rotated around the center of the text
+        theta = np.deg2rad(rotation)
+        x = (x0 + x1) / 2 + (h / 2 - d) * np.sin(theta)
+        y = (y0 + y1) / 2 - (h / 2 - d) * np.cos(theta)
+        halign, align = '', 'c'
+
+    box = (r"\makebox(0,0)" + ("[" + halign + "]" if halign else "") +
+           "{" + content.format(align=align, lines=r"\\".join(lines)) + "}")
+    if rotation != 0:
+        box = r"\rotatebox{" + "{:.1f}".format(rotation) + "}{" + box + "}"
+
+    return (r"    \put({:.8f},{:.8f}){{\color[rgb]{{{:.3f},{:.3f},{:.3f}}}{}}}%"
+            .format((x - bbox.x0) / bbox.width, (y - bbox.y0) / bbox.width,
+                    r, g, b, box) + "\n")
+
+
+def savePdf_texNative(fig, dir_fileName, **kwargs):
+    """Exporting a figure to .pdf + .pdf_tex w/o Inkscape, the texts of the
+    figure are hidden in the .pdf and placed by LaTeX via the .pdf_tex
+    :param fig: fig object to be saved
+    :param dir_fileName: string w/ Directory / Filename to save to
+    """
+    from matplotlib.text import Text
+    from matplotlib.transforms import Bbox
+
+    # Layout of the figure incl. ticks, legends, etc.
+    fig.draw_without_rendering()
+    canvas = fig.canvas
+    if not hasattr(canvas, 'get_renderer'):
+        # Figures created w/o pyplot have no renderer of their own
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        canvas = FigureCanvasAgg(fig)
+    renderer = canvas.get_renderer()
+
+    # Exported region in inches, identical to a regular savefig
+    bbox_inches = kwargs.pop('bbox_inches', matplotlib.rcParams['savefig.bbox'])
+    if bbox_inches == 'tight':
+        pad = kwargs.pop('pad_inches', matplotlib.rcParams['savefig.pad_inches'])
+        pad = pad if isinstance(pad, (int, float)) else 0.1
+        bbox_inches = fig.get_tightbbox(renderer).padded(pad)
+    elif not isinstance(bbox_inches, Bbox):
+        bbox_inches = fig.bbox_inches
+
+    # All visible texts
+    texts = [t for t in fig.findobj(Text)
+             if t.get_visible() and t.get_text().strip() and
+             (t.get_clip_on() is False or t.get_clip_box() is None or
+              t.get_clip_box().overlaps(t.get_window_extent(renderer)))]
+
+    overlays = [_textOverlay(t, bbox_inches, renderer) for t in texts]
+
+    # Graphics only .pdf
+    try:
+        for t in texts:
+            t.set_visible(False)
+        fig.savefig(dir_fileName + ".pdf", format="pdf",
+                    bbox_inches=bbox_inches, **kwargs)
+    finally:
+        for t in texts:
+            t.set_visible(True)
+
+    # LaTeX overlay
+    with open(dir_fileName + ".pdf_tex", "w", encoding="utf-8") as file:
+        file.write(_pdfTexHeader.format(
+            version=matplotlib.__version__,
+            name=os.path.basename(dir_fileName),
+            width=bbox_inches.width * 72,
+            ratio=bbox_inches.height / bbox_inches.width))
+        file.writelines(overlays)
+        file.write(_pdfTexFooter)
+
+    _recordWritten(dir_fileName + ".pdf", dir_fileName + ".pdf_tex")
+    return dir_fileName + ".pdf_tex"
+
+
+def savePgf(fig, dir_fileName, **kwargs):
+    """Exporting a figure to .pgf using the pgf-backend of matplotlib,
+    include in LaTeX w/ \\input{<filename>.pgf} (requires a LaTeX installation)
+    :param fig: fig object to be saved
+    :param dir_fileName: string w/ Directory / Filename to save to
+    """
+    fig.savefig(dir_fileName + ".pgf", backend="pgf", **kwargs)
+    _recordWritten(dir_fileName + ".pgf")
+    return dir_fileName + ".pgf"
+
+
+# Exporters entered w/ "with" per thread, savePdf_tex queues in the last one
+_activeExporters = threading.local()
+
+
+def _activeExporter():
+    # Last exporter entered in this thread or None
+    exporters = getattr(_activeExporters, 'exporters', None)
+    return exporters[-1] if exporters else None
+
+
+class _InkscapeShell:
+    """Persistent "inkscape --shell" process converting one file at a time
+    """
+    prompt = b'> '
+
+    def __init__(self, inkscape='inkscape', timeout=120):
+        self.timeout = timeout
+        self.output = queue.Queue()
+        self.process = subprocess.Popen([inkscape, '--shell'],
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+
+        # Read stdout in the background, the prompt is not followed by \n
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+        # Wait for the first prompt, a shell not responding is not used
+        try:
+            self._waitForPrompt()
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+            raise
+
+    def _read(self):
+        while True:
+            chunk = os.read(self.process.stdout.fileno(), 4096)
+            self.output.put(chunk)
+            if not chunk:
+                break
+
+    def _waitForPrompt(self):
+        buffer = b''
+        deadline = time.monotonic() + self.timeout
+        while not buffer.endswith(self.prompt):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Inkscape shell did not respond")
+            try:
+                chunk = self.output.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if not chunk:
+                raise RuntimeError("Inkscape shell terminated")
+            buffer = buffer[-64:] + chunk
+
+    def convert(self, inFile, dir_fileName):
+        # Paths must not contain the action separator
+        for path in (inFile, dir_fileName):
+            if ';' in path:
+                raise ValueError("';' is not supported in paths: " + path)
+
+        actions = ["file-open:" + inFile,
+                   "export-filename:" + dir_fileName + ".pdf",
+                   "export-type:pdf", "export-latex", "export-do",
+                   "file-close"]
+        self.process.stdin.write((";".join(actions) + "\n").encode())
+        self.process.stdin.flush()
+        self._waitForPrompt()
+
+        if not os.path.isfile(dir_fileName + ".pdf_tex"):
+            raise RuntimeError("Inkscape did not export " +
+                               dir_fileName + ".pdf_tex")
+
+    def close(self):
+        try:
+            self.process.stdin.write(b"quit\n")
+            self.process.stdin.flush()
+            self.process.wait(timeout=10)
+        except Exception:
+            self.process.kill()
+
+
+class PdfTexExporter:
+    """Exports figures to .pdf_tex in the background using a pool of
+    persistent Inkscape shells, many figures are converted per Inkscape start.
+    The figure is saved to a unique temporary .pdf when submitted, so the figure
+    can be closed or modified afterwards. The plotters queue their exports in
+    the exporter entered in their own thread.
+
+    with plotHelpers.PdfTexExporter(workers=4) as exporter:
+        plot2D(x, y, dir_fileName="plot_01", saveTex=True)  # queued
+        exporter.submit(fig, "plot_02")
+    print(exporter.summary())
+    """
+
+    def __init__(self, workers=2, inkscape='inkscape', timeout=120):
+        """
+        :param workers: int w/ number of Inkscape processes
+        :param inkscape: string w/ Inkscape executable
+        :param timeout: float w/ seconds to wait for one conversion
+        """
+        self.inkscape = inkscape
+        self.timeout = timeout
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='pyLEK-inkscape')
+        self.futures = {}
+        self.shells = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+
+    def _shell(self):
+        # One shell per worker thread, None if the shell can not be used
+        if not hasattr(self.local, 'shell'):
+            try:
+                self.local.shell = _InkscapeShell(self.inkscape, self.timeout)
+                with self.lock:
+                    self.shells.append(self.local.shell)
+            except (OSError, TimeoutError, RuntimeError):
+                self.local.shell = None
+        return self.local.shell
+
+    def _convert(self, tempPath, dir_fileName):
+        try:
+            shell = self._shell()
+            if shell is not None:
+                try:
+                    shell.convert(tempPath, dir_fileName)
+                    return dir_fileName + ".pdf_tex"
+                except (TimeoutError, RuntimeError, OSError):
+                    # Shell is in an unknown state, use single calls from now on
+                    shell.close()
+                    self.local.shell = None
+
+            # Fallback, one Inkscape process per figure
+            subprocess.run(_inkscapeCommand(tempPath, dir_fileName, self.inkscape),
+                           check=True, capture_output=True, timeout=self.timeout)
+            return dir_fileName + ".pdf_tex"
+        finally:
+            os.remove(tempPath)
+
+    def submit(self, fig, dir_fileName, **kwargs):
+        """Queues the export of a figure
+        :param fig: fig object to be saved
+        :param dir_fileName: string w/ Directory / Filename to save to
+        :rtype future: concurrent.futures.Future w/ path of the .pdf_tex
+        """
+        dir_fileName = os.path.abspath(dir_fileName)
+
+        # Figures are not thread-safe, save in the calling thread
+        tempPath = _tempPdf(fig, **kwargs)
+
+        future = self.executor.submit(self._convert, tempPath, dir_fileName)
+        self.futures[future] = dir_fileName
+        return future
+
+    def summary(self):
+        """Waits for all queued exports
+        :rtype summary: dict w/ exported files, failed exports and seconds
+        """
+        concurrent.futures.wait(list(self.futures))
+
+        exported, failed = [], {}
+        for future, dir_fileName in self.futures.items():
+            if future.exception() is None:
+                exported.append(future.result())
+            else:
+                failed[dir_fileName] = repr(future.exception())
+
+        return {"exported": exported, "failed": failed,
+                "seconds": time.monotonic() - self.start}
+
+    def close(self):
+        """Waits for all queued exports and quits the Inkscape shells
+        """
+        self.executor.shutdown(wait=True)
+        for shell in self.shells:
+            shell.close()
+        self.shells = []
+
+    def __enter__(self):
+        if getattr(_activeExporters, 'exporters', None) is None:
+            _activeExporters.exporters = []
+        _activeExporters.exporters.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _activeExporters.exporters.remove(self)
+        self.close()
+
+        for dir_fileName, error in self.summary()["failed"].items():
+            print("Failed to save " + dir_fileName + ".pdf_tex: " + error)
+
+
+# Result of the font check per font {font_active: bool}
+_checkedFonts = {}
+
+# Names of all fonts known to matplotlib, None if outdated
+_fontNames = None
+
+# Font files registered w/ matplotlib by pyLEK
+_registeredFonts = set()
+
+# System fonts have been rescanned in this process
+_systemFontsScanned = False
+
+_fontExtensions = ('.ttf', '.otf', '.ttc')
+
+
+def _defaultFontDirs():
+    """Folders named "fonts" in pyLEK/plotStyle and next to the __main__ file
+    :rtype dirs: list w/ existing folders
+    """
+    import __main__
+    import pyLEK.plotters.plotStyle as plotStyle
+
+    dirs = [os.path.join(os.path.dirname(plotStyle.__file__), 'fonts')]
+
+    main_file = getattr(__main__, "__file__", None)
+    if main_file:
+        dirs.append(os.path.join(os.path.dirname(
+            os.path.abspath(main_file)), 'fonts'))
+
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def registerFonts(paths=None):
+    """Registers font files w/ matplotlib, each file is only added once
+    per process. Without paths, the bundled fonts (pyLEK/plotStyle/fonts) and
+    the project fonts (fonts-folder next to __main__) are registered.
+    :param paths: str or list w/ font files or folders containing fonts
+    :rtype n: int w/ number of newly registered fonts
+    """
     import matplotlib.font_manager as font_manager
+    global _fontNames
+
+    if paths is None:
+        paths = _defaultFontDirs()
+    elif isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
 
+    # Collect font files, folders are searched incl. subfolders
+    fontFiles = []
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                fontFiles.extend(os.path.join(root, f) for f in filenames
+                                 if f.lower().endswith(_fontExtensions))
+        else:
+            fontFiles.append(path)
+
+    n = 0
+    for fontFile in fontFiles:
+        fontFile = os.path.abspath(fontFile)
+        if fontFile in _registeredFonts:
+            continue
+        _registeredFonts.add(fontFile)
+
+        try:
+            font_manager.fontManager.addfont(fontFile)
+            n += 1
+        except Exception as e:
+            print("Failed to register font \"" + fontFile + "\": " + str(e))
+
+    if n:
+        # Names changed, fonts missing so far have to be checked again
+        _fontNames = None
+        for font, available in list(_checkedFonts.items()):
+            if not available:
+                del _checkedFonts[font]
+
+    return n
+
+
+def _availableFonts():
+    # Get all available fonts on the computer (once until fonts are added)
+    import matplotlib.font_manager as font_manager
+    global _fontNames
+
+    if _fontNames is None:
+        _fontNames = {font.name for font in font_manager.fontManager.ttflist}
+    return _fontNames
+
+
+def _scanSystemFonts():
+    """Adds system fonts installed after matplotlib built its font cache,
+    the system is only scanned once per process
+    """
+    import matplotlib.font_manager as font_manager
+    global _systemFontsScanned
+
+    if _systemFontsScanned:
+        return
+    _systemFontsScanned = True
+
+    known = {font.fname for font in font_manager.fontManager.ttflist}
+    registerFonts([f for f in font_manager.findSystemFonts()
+                   if not (f in known)])
+
+
+def fontChecker():
+    """Checks if the font of the active style is available, the result is
+    memoized per font for the process
+    :rtype available: bool true if the font is available
+    """
     # Retrieve active font
-    font_family = plt.rcParams['font.family'][0]
-    font_active = plt.rcParams["font." + font_family][0]
+    font_family = matplotlib.rcParams['font.family'][0]
+    font_active = matplotlib.rcParams["font." + font_family][0]
+
+    if font_active in _checkedFonts:
+        return _checkedFonts[font_active]
 
-    # Get all available fonts on the computer
-    avail_Fonts = [font.name for font in font_manager.fontManager.ttflist]
+    # Bundled / project fonts
+    registerFonts()
 
     # Check if Univers for UniS has been installed
-    if not (font_active in avail_Fonts):
+    if not (font_active in _availableFonts()):
 
-        # Try rebuilding fonts
+        # Try finding newly installed fonts
         try:
-            import matplotlib
-            if matplotlib.__version__ >= '3.4.3':
-                font_manager._load_fontmanager(try_read_cache=False)
-            else:
-                font_manager._rebuild()
-        except:
+            _scanSystemFonts()
+        except Exception:
             print("Failed to rebuild fonts. Default \"" +
                   font_family + "\" font will be used.")
 
-        # Get all available fonts on the computer
-        avail_Fonts = [font.name for font in font_manager.fontManager.ttflist]
-
         # Check again
-        if not (font_active in avail_Fonts):
+        if not (font_active in _availableFonts()):
             print("In order to use \"" + font_active +
                   "\" first install it. Default \"" + font_family + "\" font will be used.")
 
+    _checkedFonts[font_active] = font_active in _availableFonts()
+    return _checkedFonts[font_active]
+
 
 # ----------------------------------------------------------------------
 # Tests / Example
@@ -10,10 +10,8 @@
 
 from colorsys import yiq_to_rgb
 import matplotlib.pyplot as plt
-import pickle as pkl
 import numpy as np
 import matplotlib.ticker as mtick
-import seaborn as sns
 
 # ----------------------------------------------------------------------
 # Imported functions
@@ -22,18 +20,21 @@ import seaborn as sns
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
                  dir_fileName=None, pieWidth=0.4, pieRadius=1.2, innerPalette='light',
                  outerLabelDistance=1.2, innerLabelDistance=1.2, autopct='%1.0f%%',
                  style_dict={}, mpl='_piechart', colorScheme='Monochrome', variation='color', customCycler=None,
                  savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                 fig=None, ax=None):
+                 fig=None, ax=None, keepFig=False, cache=False, rasterize=False):
     """Plotting bar charts on one figure in a uniform style
     :param y: list w/ data to plot, with shape [n_outer_pies, n_inner_pies]
               not each row needs to have the same shape
@@ -62,17 +63,20 @@ def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten 
     :param ax: ax object to be overwritten 
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Prepare Plots
     if isinstance(y[0], list):
@@ -98,9 +102,10 @@ def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
     # 1.) Sum over axis
     outerData = dataArr.sum(axis=1)
 
-    # An empty figure with one axe
-    if fig is None:
-        fig, ax = plt.subplots()
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -134,6 +139,8 @@ def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
     wedges = mplTuple[0]
 
     if isinstance(y[0], list):
+        import seaborn as sns
+
         # Facecolors of outer wedges
         outerFC = []
         for wedge in wedges:
@@ -210,17 +217,21 @@ def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
         else:
             leg = fig.legend(handles, labels)
 
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -231,17 +242,13 @@ def plotPieChart(y, *, title=None, outerLabels=None, innerLabels=None,
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -10,7 +10,6 @@
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
-import pickle as pkl
 import numpy as np
 import os
 import sys
@@ -22,18 +21,24 @@ import sys
 import pyLEK.plotters.plotStyle.colorCycler as colorCycler
 import pyLEK.plotters.plotStyle.mplStyle as mplStyle
 import pyLEK.plotters.plotHelpers as plotHelpers
+import pyLEK.plotters.plotAnnotations as plotAnnotations
+import pyLEK.plotters.plotData as plotData
+import pyLEK.plotters.renderCache as renderCache
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
+@renderCache.cacheable
+@plotHelpers.threadSafe
 def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, legend=None,
                 dir_fileName=None, vLines=None, vTexts=None,  hLines=None, hTexts=None,
                 xlim=[], ylim=[], xscale='linear', yscale='linear', xlabelformat='%.1f', ylabelformat='%.1f',
                 style_dict={}, mpl='_', colorScheme='Monochrome', variation='color', customCycler=None,
                 savePlt=False, savePkl=False, showPlt=False, saveTex=False,
-                fig=None, ax=None, annotate=[]):
+                fig=None, ax=None, keepFig=False, cache=False, rasterize=False, annotate=[], annotateCull=False,
+                window=None, mode=None, bins=100, colormap=None, colorbar=True):
     """Plotting 2-D Lines (x,y-plot) on one figure in a uniform style
     :param x: list w/ data to plot, with shape [datapoints]
     :param y: list w/ data to plot, with shape [datapoints]
@@ -66,25 +71,53 @@ def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, l
     :param showPlt: bool true show plot in interactive mode
     :param fig: fig object to be overwritten 
     :param ax: ax object to be overwritten 
-    :rtype fig: modified fig object
-    :rtype ax: modified ax object
+    :param keepFig: bool true to keep a figure created here open,
+                    otherwise it is closed after saving, save it later w/
+                    plotHelpers.saveFigure to keep the savefig-settings of mpl
+    :param cache: bool true to restore the saved files from an enabled
+                  renderCache instead of rendering, then (None, None) is
+                  returned. Ignored w/ fig, ax, keepFig or showPlt
+    :param rasterize: bool true or int w/ max. vertices, denser lines,
+                      markers and surfaces are rasterized in .pdf / .svg,
+                      their number is kept in fig.rasterizedArtists
+    :param annotate: list w/ tuples (text, (x, y)) or (text, (x, y), priority)
+    :param annotateCull: bool true to draw only the labels within the limits,
+                         overlapping labels w/ lower priority are left out
+    :param window: slice w/ datapoints to plot, array-likes (memmap, h5py,
+                   pandas) are sliced before reading, e.g. slice(0, None, 10)
+    :param mode: string ('hexbin', 'hist2d', 'density') to bin the points
+                 instead of drawing markers, read chunk by chunk so memmaps
+                 and h5py datasets larger than the memory can be plotted
+    :param bins: int w/ number of bins (hexagons) in x-direction, hist2d and
+                 density also take a tuple (nx, ny)
+    :param colormap: string w/ colormap of the bins, defaults to white to the
+                     first color of the cycler
+    :param colorbar: bool true to add a colorbar to the bins
+    :rtype fig: modified fig object, None if restored from renderCache
+    :rtype ax: modified ax object, None if restored from renderCache
     """
 
-    # Find plot styles
-    mplPath = mplStyle.findPlotStyle(mpl)
-
-    # Modify plot styles
-    mplStyle.modifyPlotStyle(style_dict, mplPath)
-
-    # Get the plot styles
-    mplStyle.retrievePlotStyle(style_dict, mplPath)
+    # Find, modify and activate plot styles
+    mplStyle.applyPlotStyle(mpl, style_dict)
 
     # Check font
     plotHelpers.fontChecker()
 
-    # An empty figure with one axe
-    if fig is None:
-        fig, ax = plt.subplots()
+    if not (mode is None or mode in plotData.densityModes):
+        print("Unknown mode '" + str(mode) + "', use one of: " +
+              ", ".join(plotData.densityModes))
+        mode = None
+
+    # Array-likes (memmap, h5py, pandas) are used w/o copies, binned points
+    # are read in chunks below
+    if mode is None:
+        x, y = plotData.asArray(x, window), plotData.asArray(y, window)
+    s, c = plotData.asArray(s, window), plotData.asArray(c, window)
+
+    # An empty figure with one axe, closed again below unless kept
+    ownFig = fig is None
+    if ownFig:
+        fig, ax = plotHelpers.newFigure(pyplot=showPlt or keepFig)
 
     # Setting the title of the axe-object
     if not (title is None):
@@ -114,11 +147,6 @@ def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, l
     if ylabelformat:
         ax.yaxis.set_major_formatter(FormatStrFormatter(ylabelformat))
 
-    # Anmerkungen für Punkte im Plot
-    if annotate:
-        for a in annotate:
-            ax.annotate(a[0], a[1])
-
     # Create color / linestyles
     if customCycler is None:
         customCycler = colorCycler.createCycler(colorScheme, variation)
@@ -126,14 +154,49 @@ def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, l
     # Setting the cycler
     ax.set_prop_cycle(customCycler)
 
+    # Binned points, one image / collection instead of one marker per point
+    if not (mode is None):
+        if not (s is None and c is None):
+            print("Marker size s and color c are ignored with mode='" + mode + "'")
+
+        # Points outside of the limits are not binned
+        extent = tuple(xlim) + tuple(ylim) if (xlim and ylim) else None
+
+        if colormap is None:
+            cmap = plotData.densityColormap(customCycler, fromWhite=(mode == 'density'))
+        else:
+            cmap = plotHelpers.getColormap(colormap)
+
+        if mode == 'hexbin':
+            xc, yc, counts, gridsize, extent = plotData.hexbinCounts(
+                x, y, np.max(bins), extent, window)
+            mappable = ax.hexbin(xc, yc, C=counts, reduce_C_function=np.sum,
+                                 gridsize=gridsize, extent=extent, cmap=cmap)
+            label = 'Count'
+        else:
+            counts, xedges, yedges = plotData.histogram2d(x, y, bins, extent, window)
+            if mode == 'hist2d':
+                mappable = ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts, 0).T,
+                                         cmap=cmap)
+                label = 'Count'
+            else:
+                mappable = ax.imshow(plotData.smoothDensity(counts, xedges, yedges).T,
+                                     extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]),
+                                     origin='lower', aspect='auto', interpolation='bilinear',
+                                     cmap=cmap)
+                label = 'Density'
+
+        if colorbar:
+            fig.colorbar(mappable, ax=ax, label=label)
+
     # 2D - Plot of the axe-object
-    if c and s:
+    elif c is not None and s is not None:
         ax.scatter(x, y, c=c, s=s)
 
-    elif s:
+    elif s is not None:
         ax.scatter(x, y, s=s)
 
-    elif c:
+    elif c is not None:
         ax.scatter(x, y, c=c)
 
     else:
@@ -189,17 +252,25 @@ def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, l
                     hText, rotation=0, rotation_mode='anchor',
                     horizontalalignment='left', verticalalignment='bottom',
                     fontsize='x-small')
+    # Anmerkungen für Punkte im Plot, culled when the limits are known
+    if annotate:
+        plotAnnotations.AnnotationLayer(ax, annotate, cull=annotateCull)
+
+    # Dense artists as raster images in vector files
+    if rasterize:
+        fig.rasterizedArtists = plotHelpers.rasterizeDense(fig, rasterize)
+
     # Save plot
     if savePlt == True:
         try:
-            plt.savefig(dir_fileName)
+            plotHelpers.saveFigure(fig, dir_fileName)
         except ValueError:
             print("Error saving plot: To save plot specify a file name")
 
     # Save plot with pickle
     if savePkl == True:
         try:
-            pkl.dump(ax, open(dir_fileName + ".pickle", "wb"))
+            plotHelpers.savePickle(ax, dir_fileName)
         except TypeError:
             print("Error dumping pickle: To dump pickle specify a file name")
 
@@ -210,17 +281,13 @@ def plotScatter(x, y, s=None, c=None, *, xlabel=None, ylabel=None, title=None, l
         except TypeError:
             print("Error saving .pdf_tex: To save pdf_tex specify a file name")
 
-    # Show plot in interactive mode
+    # Show plot in interactive mode, once renderLock is released
     if showPlt == True:
-        plt.show()
-
-    # Clean up mplstyles
-    mplStyle.cleanPlotStyle(mplPath)
+        plotHelpers.showFigure(fig, close=ownFig and not (keepFig or plt.isinteractive()))
 
-    # Clean up everything
-    if fig is None:
-        plt.clf()
-        plt.close()
+    # Clean up everything, figures passed in belong to the caller
+    if ownFig and not (keepFig or showPlt):
+        plt.close(fig)
 
     return fig, ax
 
@@ -0,0 +1,6 @@
+from pyLEK.helpers.lazy import lazyModule
+
+# Submodules are imported on first access, e.g. pyLEK.plotters.plotStyle.mplStyle
+_submodules = {"colorCycler", "mplStyle"}
+
+__getattr__, __dir__ = lazyModule(__name__, _submodules)
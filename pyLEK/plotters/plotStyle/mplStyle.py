@@ -8,117 +8,418 @@
 # Libraries
 # ----------------------------------------------------------------------
 
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.style
+import collections
+import contextlib
+import json
 import os
+import sys
+import tempfile
 from pyLEK.helpers import filemanager
+from pyLEK.helpers.deprecated import deprecated
 
 # ----------------------------------------------------------------------
 # Functions
 # ----------------------------------------------------------------------
 
 
-def findPlotStyle(mpl):
+# Index of the .mplstyle-sheets found below each search root
+# {root: {"mtimes": {dirpath: mtime}, "styles": {mpl: mplPath}}}
+_styleIndex = {}
+
+# Persisted index has been read from disk / index changed since
+_indexLoaded = False
+_indexChanged = False
+
+_indexFileName = 'styleIndex.json'
+_indexVersion = 2
+
+
+def _searchRoots():
+    """Folders to search for .mplstyle-sheets in the order of priority
+    :rtype roots: list w/ tuples (root, source)
+    """
     import __main__
     import pathlib
-    import os
-    import sys
+    import site
 
-    # 1) Look in pyLEK for choosen mpstyle
-    try:
-        # Get path of this file (..pyLEK/plotStyle)
-        thisDir = os.path.dirname(os.path.realpath(__file__))
-
-        # Search in the folder of this file (..pyLEK/plotStyle)
-        mplStyles, mplPaths = filemanager.scanSubdirsForFilesWithExtension(
-            thisDir, ".mplstyle")
-
-        if mpl + ".mplstyle" in mplStyles:
-            i = mplStyles.index(mpl + ".mplstyle")
-            mplPath = mplPaths[i]
-            mplPath = os.path.splitext(mplPath)[0]
-            print('Using pyLEK-default .mplstyle: ' + mplPath)
-            return mplPath
-    except Exception:
-        # ignore and continue searching other locations
-        pass
+    roots = []
+
+    # 1) Look in pyLEK for choosen mpstyle (..pyLEK/plotStyle)
+    roots.append((os.path.dirname(os.path.realpath(__file__)), 'pyLEK-default'))
 
     # 2) Look in path of __main__ file for choosen mpstyle
-    try:
-        main_file = getattr(__main__, "__file__", None)
-        if main_file:
-            mainFolder = str(pathlib.Path(main_file).parent.resolve())
-
-            # Search in the folder and subfolders of __main__
-            mplStyles, mplPaths = filemanager.scanSubdirsForFilesWithExtension(
-                mainFolder, ".mplstyle")
-
-            if mpl + ".mplstyle" in mplStyles:
-                i = mplStyles.index(mpl + ".mplstyle")
-                mplPath = mplPaths[i]
-                mplPath = os.path.splitext(mplPath)[0]
-                print('Using custom .mplstyle: ' + mplPath)
-                return mplPath
-    except Exception:
-        pass
+    main_file = getattr(__main__, "__file__", None)
+    if main_file:
+        try:
+            roots.append(
+                (str(pathlib.Path(main_file).parent.resolve()), 'custom'))
+        except Exception:
+            pass
 
     # 3) Look in PYTHONPATH for choosen mpstyle
     pythonPath = os.environ.get('PYTHONPATH', '')
     if pythonPath:
         for path in pythonPath.split(os.pathsep):
-            try:
-                # Search in the folder and subfolders of PYTHONPATH
-                mplStyles, mplPaths = filemanager.scanSubdirsForFilesWithExtension(
-                    path, ".mplstyle")
-
-                if mpl + ".mplstyle" in mplStyles:
-                    i = mplStyles.index(mpl + ".mplstyle")
-                    mplPath = mplPaths[i]
-                    mplPath = os.path.splitext(mplPath)[0]
-                    print('Using PYTHONPATH .mplstyle: ' + mplPath)
-                    return mplPath
-            except Exception:
-                continue
+            roots.append((path, 'PYTHONPATH'))
 
     # 4) Look in installed site-packages or sys.path for choosen mpstyle
     try:
-        import site
-        try:
-            sitePaths = site.getsitepackages()
-        except Exception:
-            sitePaths = []
-
-        # include sys.path as a fallback search space
-        search_paths = list(sitePaths) + list(sys.path)
-
-        for sitePath in search_paths:
-            try:
-                # Search in the folder and subfolders of site-packages / sys.path entries
-                mplStyles, mplPaths = filemanager.scanSubdirsForFilesWithExtension(
-                    sitePath, ".mplstyle")
-
-                if mpl + ".mplstyle" in mplStyles:
-                    i = mplStyles.index(mpl + ".mplstyle")
-                    mplPath = mplPaths[i]
-                    mplPath = os.path.splitext(mplPath)[0]
-                    print('Using site-packages .mplstyle: ' + mplPath)
-                    return mplPath
-            except Exception:
-                continue
+        sitePaths = site.getsitepackages()
     except Exception:
+        sitePaths = []
+
+    # include sys.path as a fallback search space
+    for sitePath in list(sitePaths) + list(sys.path):
+        roots.append((sitePath, 'site-packages'))
+
+    # A root listed twice would be found at its first position anyway
+    unique, seen = [], set()
+    for root, source in roots:
+        if root and not (root in seen) and os.path.isdir(root):
+            seen.add(root)
+            unique.append((root, source))
+
+    return unique
+
+
+def _scanRoot(root):
+    """Walks once through root and records all .mplstyle-sheets
+    :param root: string w/ folder to scan
+    :rtype entry: dict w/ styles {mpl: mplPath} and mtimes of all scanned
+                  folders, sheets added / removed in any subfolder change them
+    """
+    styles = {}
+    mtimes = {}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        try:
+            mtimes[dirpath] = os.stat(dirpath).st_mtime
+        except OSError:
+            continue
+
+        for filename in filenames:
+            if filename.endswith(".mplstyle"):
+                mpl = filename[:-len(".mplstyle")]
+                # First match wins, same as the former list search
+                if not (mpl in styles):
+                    styles[mpl] = os.path.join(dirpath, mpl)
+
+    return {"mtimes": mtimes, "styles": styles}
+
+
+def _isFresh(entry):
+    """Checks if the recorded mtimes of an index entry are still valid
+    :param entry: dict w/ index entry of a root
+    :rtype fresh: bool
+    """
+    try:
+        for dirpath, mtime in entry["mtimes"].items():
+            if os.stat(dirpath).st_mtime != mtime:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _loadStyleIndex():
+    """Reads the persisted index from the cache directory (once per process)
+    """
+    global _indexLoaded
+    if _indexLoaded:
+        return
+    _indexLoaded = True
+
+    try:
+        path = os.path.join(filemanager.getCacheDir(), _indexFileName)
+        with open(path, 'r') as file:
+            data = json.load(file)
+        if data.get("version") == _indexVersion:
+            for root, entry in data["roots"].items():
+                _styleIndex.setdefault(root, entry)
+    except (OSError, ValueError, KeyError, AttributeError):
+        # No or unreadable index, it is rebuilt when needed
+        pass
+
+
+def saveStyleIndex():
+    """Persists the index of .mplstyle-sheets in the cache directory
+    """
+    global _indexChanged
+    _indexChanged = False
+
+    try:
+        cacheDir = filemanager.getCacheDir()
+        path = os.path.join(cacheDir, _indexFileName)
+
+        # Write to a temporary file first, parallel processes only ever see
+        # a complete index
+        fd, tempPath = tempfile.mkstemp(dir=cacheDir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump({"version": _indexVersion, "roots": _styleIndex}, file)
+        os.replace(tempPath, path)
+    except OSError:
+        # Read-only home / cache directory, index stays in memory
         pass
 
-    raise FileNotFoundError(
-        f".mplstyle '{mpl}.mplstyle' not found. Please specify a valid .mplstyle")
+
+def clearStyleIndex(persisted=False):
+    """Forgets all indexed .mplstyle-sheets, next lookup scans again
+    :param persisted: bool true to delete the persisted index as well
+    """
+    global _indexLoaded
+    _styleIndex.clear()
+    _indexLoaded = persisted
+
+    if persisted:
+        try:
+            os.remove(os.path.join(
+                filemanager.getCacheDir(), _indexFileName))
+        except OSError:
+            pass
+
+
+def _rootStyles(root, rescan=False):
+    """Styles below root, scanned only if the index is missing or outdated
+    (checked by the mtimes of its folders on every lookup)
+    :param root: string w/ folder to search
+    :param rescan: bool true to scan regardless of the index
+    :rtype styles: dict w/ {mpl: mplPath}
+    """
+    entry = _styleIndex.get(root)
+    if rescan or entry is None or not _isFresh(entry):
+        try:
+            entry = _scanRoot(root)
+        except OSError:
+            entry = {"mtimes": {}, "styles": {}}
+        _styleIndex[root] = entry
+
+        global _indexChanged
+        _indexChanged = True
+
+    return entry["styles"]
+
+
+def _lookupStyle(mpl, rescan=False):
+    """Searches the roots in the order of priority, the roots after the
+    one containing the sheet are not checked
+    :param mpl: string w/ name of the mplstyle-sheet
+    :param rescan: bool true to scan regardless of the index
+    :rtype mplPath, source: tuple w/ path and source or None
+    """
+    for root, source in _searchRoots():
+        styles = _rootStyles(root, rescan=rescan)
+        if mpl in styles:
+            mplPath = styles[mpl]
+            if os.path.isfile(mplPath + ".mplstyle"):
+                return mplPath, source
+
+            # Sheet was removed since indexing
+            styles = _rootStyles(root, rescan=True)
+            if mpl in styles:
+                return styles[mpl], source
+
+    return None
+
+
+def lookupPlotStyle(mpl):
+    """Finds the path of a mplstyle-sheet w/o printing it. The locations of
+    all sheets are indexed once and persisted in the cache directory, a
+    lookup only checks the mtimes of the indexed folders.
+    :param mpl: string w/ name of the mplstyle-sheet
+    :rtype mplPath: string w/ path to the sheet without extension
+    :rtype source: string w/ location of the sheet, e.g. 'pyLEK-default'
+    """
+    _loadStyleIndex()
+
+    result = _lookupStyle(mpl)
+
+    # Not indexed, e.g. on file systems w/ coarse mtimes
+    if result is None:
+        result = _lookupStyle(mpl, rescan=True)
+
+    if _indexChanged:
+        saveStyleIndex()
+
+    if result is None:
+        raise FileNotFoundError(
+            f".mplstyle '{mpl}.mplstyle' not found. Please specify a valid .mplstyle")
+
+    return result
+
+
+def findPlotStyle(mpl):
+    """Finds the path of a mplstyle-sheet (see lookupPlotStyle)
+    :param mpl: string w/ name of the mplstyle-sheet
+    :rtype mplPath: string w/ path to the sheet without extension
+    """
+    mplPath, source = lookupPlotStyle(mpl)
+    print('Using ' + source + ' .mplstyle: ' + mplPath)
+    return mplPath
+
+
+# Parsed mplstyle-sheets, least recently used are dropped first
+# {(mplPath, mtime): dict w/ rcParams}
+_parsedStyles = collections.OrderedDict()
+_parsedStylesSize = 16
+
+# Sheets merged w/ style_dict {(mplPath, mtime, styleKey): dict w/ rcParams}
+_mergedStyles = collections.OrderedDict()
+_mergedStylesSize = 64
+
+
+def _cacheGet(cache, key):
+    # Mark entry as recently used
+    cache.move_to_end(key)
+    return cache[key]
+
+
+def _cachePut(cache, key, value, size):
+    cache[key] = value
+    while len(cache) > size:
+        cache.popitem(last=False)
+    return value
+
+
+def setStyleCacheSize(parsed=16, merged=64):
+    """Sets the number of parsed sheets / merged styles kept in memory
+    :param parsed: int w/ max. number of parsed mplstyle-sheets
+    :param merged: int w/ max. number of sheets merged w/ a style_dict
+    """
+    global _parsedStylesSize, _mergedStylesSize
+    _parsedStylesSize, _mergedStylesSize = parsed, merged
+
+    for cache, size in ((_parsedStyles, parsed), (_mergedStyles, merged)):
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+def clearStyleCache():
+    """Forgets all parsed and merged mplstyle-sheets
+    """
+    _parsedStyles.clear()
+    _mergedStyles.clear()
+
+
+def _valueKey(value):
+    """Hashable representation of a style_dict value built from its full
+    content (repr of numpy arrays is truncated)
+    :param value: str, number, list, tuple, dict, array or cycler
+    :rtype key: tuple
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return (type(value).__name__, value)
+    if hasattr(value, 'by_key') and hasattr(value, 'keys'):
+        # cycler, by all its entries
+        return ('cycler', _valueKey(list(value)))
+    if hasattr(value, 'tolist') and hasattr(value, 'dtype'):
+        # numpy arrays and scalars
+        return ('array', str(value.dtype), getattr(value, 'shape', ()),
+                _valueKey(value.tolist()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_valueKey(item) for item in value))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(k), _valueKey(v)) for k, v in value.items())))
+    raise TypeError("No hashable representation of " + type(value).__name__)
+
+
+def _styleKey(style_dict):
+    """Hashable representation of a style_dict, values may be lists etc.
+    :param style_dict: dict w/ settings to overwrite mplstyle-template
+    :rtype key: tuple or None if a value can not be represented, such
+                style_dicts are not cached
+    """
+    try:
+        return tuple(sorted((str(key), _valueKey(value))
+                            for key, value in style_dict.items()))
+    except TypeError:
+        return None
+
+
+def _mtime(mplPath):
+    return os.stat(mplPath + '.mplstyle').st_mtime
+
+
+def readPlotStyle(mplPath):
+    """Parses a mplstyle-sheet, sheets are cached until they are modified
+    :param mplPath: string w/ path to the sheet without extension
+    :rtype style: dict w/ rcParams of the sheet, must not be modified
+    """
+    key = (mplPath, _mtime(mplPath))
+
+    if key in _parsedStyles:
+        return _cacheGet(_parsedStyles, key)
+
+    style = dict(matplotlib.rc_params_from_file(
+        mplPath + '.mplstyle', use_default_template=False))
+
+    return _cachePut(_parsedStyles, key, style, _parsedStylesSize)
+
+
+def mergePlotStyle(mplPath, style_dict):
+    """Overlays the settings of style_dict on a parsed mplstyle-sheet,
+    the result is cached for each combination of sheet and style_dict
+    :param mplPath: string w/ path to the sheet without extension
+    :param style_dict: dict w/ settings to overwrite mplstyle-template
+    :rtype style: dict w/ validated rcParams, must not be modified
+    """
+    styleKey = _styleKey(style_dict)
+    key = (mplPath, _mtime(mplPath), styleKey)
+
+    if styleKey is not None and key in _mergedStyles:
+        return _cacheGet(_mergedStyles, key)
+
+    style = dict(readPlotStyle(mplPath))
+
+    for key_, value in style_dict.items():
+        try:
+            style[key_] = matplotlib.rcParams.validate[key_](value)
+        except KeyError:
+            print("Unknown key in style_dict: \"" + str(key_) + "\" is ignored")
+        except ValueError as e:
+            print("Invalid value in style_dict for \"" + str(key_) +
+                  "\" is ignored: " + str(e))
+
+    if styleKey is None:
+        return style
+    return _cachePut(_mergedStyles, key, style, _mergedStylesSize)
+
+
+def applyPlotStyle(mpl, style_dict={}):
+    """Finds a mplstyle-sheet, modifies it w/ style_dict in memory and
+    activates it, no temporary files are written
+    :param mpl: string w/ name of the mplstyle-sheet
+    :param style_dict: dict w/ settings to overwrite mplstyle-template
+    :rtype mplPath: string w/ path to the sheet without extension
+    """
+    mplPath = findPlotStyle(mpl)
+    matplotlib.style.use(mergePlotStyle(mplPath, style_dict))
+
+    return mplPath
+
+
+@contextlib.contextmanager
+def plotStyle(mpl, style_dict={}):
+    """Context manager activating a modified mplstyle-sheet, the previous
+    rcParams are restored afterwards
+    :param mpl: string w/ name of the mplstyle-sheet
+    :param style_dict: dict w/ settings to overwrite mplstyle-template
+    """
+    with matplotlib.rc_context():
+        yield applyPlotStyle(mpl, style_dict)
 
 
+@deprecated("use pyLEK.plotters.plotStyle.mplStyle.applyPlotStyle() instead")
 def retrievePlotStyle(style_dict, mplpath):
     # Retrieving the current plot settings
     if bool(style_dict):
-        plt.style.use(mplpath + '_temp.mplstyle')
+        matplotlib.style.use(mplpath + '_temp.mplstyle')
     else:
-        plt.style.use(mplpath + '.mplstyle')
+        matplotlib.style.use(mplpath + '.mplstyle')
 
 
+@deprecated("use pyLEK.plotters.plotStyle.mplStyle.applyPlotStyle() instead")
 def modifyPlotStyle(style_dict, mplpath):
     # Modify the plot settings
     # mplstyle-format:  key : val # optional comment
@@ -143,6 +444,7 @@ def modifyPlotStyle(style_dict, mplpath):
             file.write(line)
 
 
+@deprecated("use pyLEK.plotters.plotStyle.mplStyle.applyPlotStyle() instead")
 def cleanPlotStyle(mplpath):
     # delete temporary mplstyles
     os.remove(mplpath + '_temp.mplstyle')
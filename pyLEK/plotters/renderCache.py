@@ -0,0 +1,424 @@
+# ------------------------------------------------------------------------------
+# Description:  Content-addressed cache for the files saved by the plotters
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Import functions / collections (from pyLEK.plotters import renderCache)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import matplotlib
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+import pyLEK
+import pyLEK.plotters.plotStyle.mplStyle as mplStyle
+from pyLEK.helpers import filemanager
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+# Active cache, None if disabled
+_cache = None
+
+# Hash of the .mplstyle-sheets {(mplPath, mtime): sha256}
+_styleHashes = {}
+
+_indexFileName = 'index.json'
+_lockFileName = 'index.lock'
+
+
+@contextlib.contextmanager
+def _fileLock(path):
+    """Exclusive lock of a file, shared by all processes using the cache
+    :param path: string w/ path of the lock file
+    """
+    with open(path, 'a+b') as file:
+        if os.name == 'nt':
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class RenderCache:
+    """Files saved by the plotters (savePlt, saveTex, savePkl), stored by a
+    hash of all inputs, the style and the library versions. Least recently
+    used entries are evicted when the cache exceeds maxBytes. Several
+    processes may share one directory, the index is read and written under
+    a file lock.
+    """
+
+    def __init__(self, directory=None, maxBytes=500 * 1024**2):
+        """
+        :param directory: string w/ folder of the cache, defaults to the
+                          pyLEK cache directory
+        :param maxBytes: int w/ max. size of the stored files in bytes
+        """
+        self.directory = directory or filemanager.getCacheDir('renderCache')
+        os.makedirs(self.directory, exist_ok=True)
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+        with self._locked():
+            self.entries = self._readIndex()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # Other threads and processes; the index is read again w/in the lock
+        with self.lock, _fileLock(os.path.join(self.directory, _lockFileName)):
+            yield
+
+    def count(self, counter):
+        """Increments a statistic of the cache
+        :param counter: string ('hits', 'misses')
+        """
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _readIndex(self):
+        try:
+            with open(os.path.join(self.directory, _indexFileName), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _writeIndex(self):
+        # Atomic, readers see either the old or the new index
+        try:
+            fd, tempPath = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(self.entries, file)
+            os.replace(tempPath, os.path.join(self.directory, _indexFileName))
+        except OSError:
+            try:
+                os.remove(tempPath)
+            except OSError:
+                pass
+
+    def _entryDir(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def size(self):
+        """Size of all stored files
+        :rtype size: int w/ bytes
+        """
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def restore(self, key, dir_fileName):
+        """Copies the stored files of key to dir_fileName
+        :param key: string w/ render key
+        :param dir_fileName: string w/ Directory / Filename to save to
+        :rtype hit: bool true if all files were restored
+        """
+        with self._locked():
+            self.entries = self._readIndex()
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+
+            entryDir = self._entryDir(key)
+            try:
+                for suffix in entry["suffixes"]:
+                    shutil.copyfile(os.path.join(entryDir, 'out' + suffix),
+                                    dir_fileName + suffix)
+            except OSError:
+                # Files were removed from the cache directory
+                self._remove(key)
+                self._writeIndex()
+                return False
+
+            entry["access"] = time.time()
+            self._writeIndex()
+            return True
+
+    def store(self, key, dir_fileName, paths):
+        """Stores the files written by a plotter
+        :param key: string w/ render key
+        :param dir_fileName: string w/ Directory / Filename saved to
+        :param paths: list w/ paths written (plotHelpers.recordWrittenFiles),
+                      only files named dir_fileName(.*) are stored
+        """
+        paths = [p for p in dict.fromkeys(paths)
+                 if p.startswith(dir_fileName) and os.path.isfile(p)]
+        if not paths:
+            return
+
+        with self._locked():
+            self.entries = self._readIndex()
+            entryDir = self._entryDir(key)
+            os.makedirs(entryDir, exist_ok=True)
+
+            suffixes, nbytes = [], 0
+            for path in paths:
+                suffix = path[len(dir_fileName):]
+                shutil.copyfile(path, os.path.join(entryDir, 'out' + suffix))
+                suffixes.append(suffix)
+                nbytes += os.path.getsize(path)
+
+            self.entries[key] = {"suffixes": suffixes, "bytes": nbytes,
+                                 "access": time.time()}
+            self._evict()
+            self._writeIndex()
+
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        shutil.rmtree(self._entryDir(key), ignore_errors=True)
+
+    def _removeOrphans(self):
+        # Entry directories missing in the index, e.g. of an index lost by
+        # an older version, are not counted by size()
+        for prefix in os.listdir(self.directory):
+            prefixDir = os.path.join(self.directory, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefixDir):
+                continue
+            for key in os.listdir(prefixDir):
+                if not (key in self.entries):
+                    shutil.rmtree(os.path.join(prefixDir, key), ignore_errors=True)
+
+    def _evict(self):
+        self._removeOrphans()
+
+        # Least recently used first
+        size = self.size()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["access"]):
+            if size <= self.maxBytes:
+                break
+            size -= self.entries[key]["bytes"]
+            self._remove(key)
+            self.evictions += 1
+
+    def clear(self):
+        """Removes all stored files
+        """
+        with self._locked():
+            self.entries = self._readIndex()
+            for key in list(self.entries):
+                self._remove(key)
+            self._removeOrphans()
+            self._writeIndex()
+
+    def stats(self):
+        """Statistics of the cache, hits / misses / evictions of this process
+        :rtype stats: dict w/ hits, misses, evictions, entries and bytes
+        """
+        with self._locked():
+            self.entries = self._readIndex()
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self.entries),
+                    "bytes": self.size()}
+
+
+def enable(directory=None, maxBytes=500 * 1024**2):
+    """Activates the render cache for all plotters
+    :param directory: string w/ folder of the cache
+    :param maxBytes: int w/ max. size of the stored files in bytes
+    :rtype cache: RenderCache
+    """
+    global _cache
+    _cache = RenderCache(directory, maxBytes)
+    return _cache
+
+
+def disable():
+    """Deactivates the render cache, stored files are kept
+    """
+    global _cache
+    _cache = None
+
+
+def stats():
+    """Statistics of the active cache
+    :rtype stats: dict w/ hits, misses, evictions, entries, bytes or None
+    """
+    return None if _cache is None else _cache.stats()
+
+
+def _styleHash(mpl):
+    # Content of the resolved .mplstyle-sheet, hashed once per modification
+    path = mplStyle.lookupPlotStyle(mpl)[0] + '.mplstyle'
+    key = (path, os.stat(path).st_mtime)
+    if not (key in _styleHashes):
+        with open(path, 'rb') as file:
+            _styleHashes[key] = hashlib.sha256(file.read()).hexdigest()
+    return _styleHashes[key]
+
+
+def _update(h, value):
+    """Feeds a canonical representation of value into the hash
+    :param h: hashlib object
+    :param value: argument of a plotter
+    """
+    if hasattr(value, 'to_numpy') and not isinstance(value, np.ndarray):
+        # pandas objects
+        value = value.to_numpy()
+
+    if hasattr(value, 'triangles') and hasattr(value, 'x') and hasattr(value, 'y'):
+        # matplotlib.tri.Triangulation, by its points and triangles
+        value = (value.x, value.y, value.triangles, value.mask)
+
+    if isinstance(value, np.memmap):
+        # Content is hashed, the file might have changed since opening it
+        value = np.asarray(value)
+    elif (not isinstance(value, np.ndarray) and hasattr(value, 'shape') and
+          hasattr(value, 'dtype') and hasattr(value, '__getitem__')):
+        # h5py.Dataset alike, identified by file, name and modification time
+        try:
+            fileName = value.file.filename
+            h.update(b'dataset' + repr((fileName, value.name, os.stat(fileName).st_mtime,
+                                        tuple(value.shape), str(value.dtype))).encode())
+            return
+        except (AttributeError, OSError, TypeError):
+            value = np.asarray(value[...])
+
+    if isinstance(value, np.ndarray):
+        h.update(b'ndarray' + value.dtype.str.encode() +
+                 repr(value.shape).encode())
+        if value.dtype.hasobject:
+            h.update(repr(value.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(value))
+    elif isinstance(value, (list, tuple)):
+        h.update(b'(' if isinstance(value, tuple) else b'[')
+        for item in value:
+            _update(h, item)
+            h.update(b',')
+        h.update(b')')
+    elif isinstance(value, dict):
+        h.update(b'{')
+        for key in sorted(value, key=repr):
+            _update(h, key)
+            h.update(b':')
+            _update(h, value[key])
+            h.update(b',')
+        h.update(b'}')
+    else:
+        h.update(repr(value).encode())
+
+
+def renderKey(plotter, params):
+    """Hash of a plotter call
+    :param plotter: plotter function
+    :param params: dict w/ all arguments of the call
+    :rtype key: string w/ sha256 hexdigest
+    """
+    h = hashlib.sha256()
+    h.update(("pyLEK " + pyLEK.__version__ + " matplotlib " +
+              matplotlib.__version__ + " numpy " + np.__version__).encode())
+    h.update((plotter.__module__ + "." + plotter.__qualname__).encode())
+
+    if 'mpl' in params:
+        h.update(_styleHash(params['mpl']).encode())
+
+    _update(h, params)
+    return h.hexdigest()
+
+
+def _isCacheable(params):
+    # Only calls asking for it (cache=True), creating (and closing) their own
+    # figure and saving files; the caller does not get the figure back
+    return (params.get('cache') is True and
+            params.get('fig') is None and params.get('ax') is None and
+            not params.get('showPlt') and not params.get('keepFig') and
+            isinstance(params.get('dir_fileName'), str) and
+            any(params.get(k) for k in ('savePlt', 'saveTex', 'savePkl')))
+
+
+def cacheable(plotter):
+    """Decorator for the plotters, with an active cache a call w/ cache=True
+    and known inputs restores the saved files instead of rendering and
+    returns (None, None) instead of (fig, ax)
+    :param plotter: plotter function
+    """
+    signature = inspect.signature(plotter)
+
+    @functools.wraps(plotter)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return plotter(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = bound.arguments
+
+        # Exports queued in a PdfTexExporter are written later
+        import pyLEK.plotters.plotHelpers as plotHelpers
+        if not _isCacheable(params) or (params.get('saveTex') and
+                                        plotHelpers._activeExporter() is not None):
+            return plotter(*args, **kwargs)
+
+        key = renderKey(plotter, params)
+        dir_fileName = params['dir_fileName']
+
+        if cache.restore(key, dir_fileName):
+            cache.count('hits')
+            return None, None
+
+        cache.count('misses')
+        with plotHelpers.recordWrittenFiles() as paths:
+            result = plotter(*args, **kwargs)
+        cache.store(key, dir_fileName, paths)
+        return result
+
+    return wrapper
+
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def sample():
+    from pyLEK.plotters.plot2D import plot2D
+
+    cache = enable(directory=os.path.join(tempfile.gettempdir(), 'pyLEK_renderCache'),
+                   maxBytes=50 * 1024**2)
+
+    x = np.linspace(0, 2 * np.pi, 50)
+    y = np.sin(x)
+    dir_fileName = os.path.join(tempfile.gettempdir(), 'renderCache_example')
+
+    # First call renders, second call restores the saved file
+    for i in range(2):
+        start = time.time()
+        plot2D(x, y, dir_fileName=dir_fileName, savePlt=True, cache=True)
+        print("Call {}: {:.3f} s".format(i + 1, time.time() - start))
+
+    print(cache.stats())
+    disable()
+
+
+if __name__ == "__main__":
+    sample()
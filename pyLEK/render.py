@@ -0,0 +1,222 @@
+# ------------------------------------------------------------------------------
+# Description:  Rendering lists of plot specs in parallel worker processes
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    Executing from command line (python -m pyLEK.render specs.json --jobs 8)
+#               Import functions / collections (from pyLEK import render)
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import argparse
+import concurrent.futures
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+# Plotters which can be named in a spec {name: module}
+plotters = {
+    "plot1D": "pyLEK.plotters.plot1D",
+    "plot2D": "pyLEK.plotters.plot2D",
+    "plot3D_surf": "pyLEK.plotters.plot3D_surf",
+    "plot3D_trisurf": "pyLEK.plotters.plot3D_trisurf",
+    "plot4D_surf": "pyLEK.plotters.plot4D_surf",
+    "plotBarChart": "pyLEK.plotters.plotBarChart",
+    "plotPieChart": "pyLEK.plotters.plotPieChart",
+    "plotScatter": "pyLEK.plotters.plotScatter",
+}
+
+
+def getPlotter(name):
+    """Returns the plotter function of a spec
+    :param name: string w/ name of the plotter, e.g. 'plot2D'
+    :rtype plotter: function
+    """
+    if not (name in plotters):
+        raise ValueError("Unknown plotter '" + str(name) + "', use one of: " +
+                         ", ".join(plotters))
+    return getattr(importlib.import_module(plotters[name]), name)
+
+
+def _styles(specs):
+    # All .mplstyle-sheets used by the specs, incl. the plotter defaults
+    styles = set()
+    for spec in specs:
+        try:
+            default = inspect.signature(getPlotter(spec["plotter"])).parameters['mpl'].default
+        except (KeyError, ValueError):
+            continue
+        styles.add(spec.get("kwargs", {}).get("mpl", default))
+    return sorted(styles)
+
+
+def _initWorker(styles):
+    """Prepares a worker process: Agg backend, style index and fonts are
+    loaded once and kept for all jobs of the worker
+    :param styles: list w/ names of the mplstyle-sheets to preload
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import pyLEK.plotters.plotStyle.mplStyle as mplStyle
+    import pyLEK.plotters.plotHelpers as plotHelpers
+
+    for mpl in styles:
+        try:
+            with mplStyle.plotStyle(mpl):
+                plotHelpers.fontChecker()
+        except FileNotFoundError:
+            pass
+
+
+def _asArray(arg):
+    # JSON lists to arrays, ragged or non-numeric data is passed as it is
+    if isinstance(arg, list):
+        try:
+            return np.asarray(arg, dtype=float)
+        except (TypeError, ValueError):
+            return arg
+    return arg
+
+
+def renderSpec(spec):
+    """Renders a single spec
+    :param spec: dict w/ "plotter", "args" (list) and "kwargs" (dict)
+    :rtype result: dict w/ plotter, dir_fileName, seconds and error (None
+                   or string w/ traceback)
+    """
+    import matplotlib.pyplot as plt
+
+    kwargs = dict(spec.get("kwargs", {}))
+    kwargs["showPlt"] = False
+
+    result = {"plotter": spec.get("plotter"),
+              "dir_fileName": kwargs.get("dir_fileName"),
+              "seconds": 0.0, "error": None}
+
+    start = time.perf_counter()
+    try:
+        plotter = getPlotter(spec.get("plotter"))
+        args = [_asArray(arg) for arg in spec.get("args", [])]
+        plotter(*args, **kwargs)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    finally:
+        plt.close('all')
+    result["seconds"] = time.perf_counter() - start
+
+    return result
+
+
+def renderSpecs(specs, jobs=None):
+    """Renders a list of plot specs in parallel worker processes
+    :param specs: list w/ dicts {"plotter": 'plot2D', "args": [x, y],
+                  "kwargs": {"dir_fileName": ..., "savePlt": True}}
+    :param jobs: int w/ number of worker processes, defaults to cpu count,
+                 1 renders in the current process
+    :rtype results: list w/ one result dict per spec (see renderSpec), in
+                    the order of specs
+    """
+    specs = list(specs)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(specs)))
+    styles = _styles(specs)
+
+    if jobs == 1:
+        _initWorker(styles)
+        return [renderSpec(spec) for spec in specs]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs,
+                                                initializer=_initWorker,
+                                                initargs=(styles,)) as pool:
+        return list(pool.map(renderSpec, specs))
+
+
+def summary(results):
+    """Summary of rendered specs
+    :param results: list w/ results of renderSpecs
+    :rtype summary: dict w/ rendered, failed and seconds (sum of all jobs)
+    """
+    failed = [r for r in results if r["error"]]
+    return {"rendered": len(results) - len(failed), "failed": len(failed),
+            "seconds": sum(r["seconds"] for r in results)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pyLEK.render",
+        description="Render a .json list of plot specs in parallel")
+    parser.add_argument("specs", help=".json file w/ list of plot specs")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="number of worker processes (default: cpu count)")
+    parser.add_argument("--report", default=None,
+                        help=".json file to write the per-job results to")
+    options = parser.parse_args(argv)
+
+    with open(options.specs, 'r') as file:
+        specs = json.load(file)
+
+    start = time.perf_counter()
+    results = renderSpecs(specs, jobs=options.jobs)
+    wallTime = time.perf_counter() - start
+
+    for i, result in enumerate(results):
+        status = "failed" if result["error"] else "ok"
+        print("{:>4} {:<15} {:>8.3f} s  {:<6} {}".format(
+            i, str(result["plotter"]), result["seconds"], status,
+            result["dir_fileName"]))
+        if result["error"]:
+            print(result["error"])
+
+    stats = summary(results)
+    print("Rendered {} specs ({} failed) in {:.1f} s ({:.1f} s CPU in jobs)".format(
+        len(results), stats["failed"], wallTime, stats["seconds"]))
+
+    if options.report:
+        with open(options.report, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    return 1 if stats["failed"] else 0
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def sample(jobs=4):
+    import tempfile
+
+    outFolder = tempfile.mkdtemp(prefix='pyLEK_render_')
+    x = np.linspace(0, 2 * np.pi, 200)
+
+    specs = []
+    for i in range(8):
+        specs.append({"plotter": "plot2D",
+                      "args": [x, np.sin((i + 1) * x)],
+                      "kwargs": {"dir_fileName": os.path.join(outFolder, "sin_" + str(i)),
+                                 "title": "sin(" + str(i + 1) + "x)",
+                                 "savePlt": True}})
+    specs.append({"plotter": "plotBarChart",
+                  "args": [[[1, 2, 3], [2, 3, 1]]],
+                  "kwargs": {"dir_fileName": os.path.join(outFolder, "bars"),
+                             "savePlt": True}})
+
+    results = renderSpecs(specs, jobs=jobs)
+    print(summary(results))
+    print("Saved to " + outFolder)
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -97,6 +97,15 @@ class MplWidget(QtWidgets.QWidget):
         # plot function.
         # See https://stackoverflow.com/questions/6309472/matplotlib-can-i-create-axessubplot-objects-then-add-them-to-a-figure-instance
 
+    # Live plot: append new samples to the returned handle, handle.append(x, y)
+    # redraws only the lines (blitting) instead of calling plot2D again
+    def plot2D_stream(self, nSeries=1, *, history=10000, refresh=1/30, **kwargs):
+        # Clear
+        self.canvas.ax.clear()
+
+        return plot2D.plot2D_stream(nSeries, history=history, refresh=refresh,
+                                    fig=self.canvas.fig, ax=self.canvas.ax, **kwargs)
+
     def plotBarChart(self, y, *, xlabel=None, ylabel=None, title=None, legend=None,
                      xticks=None, xticklabels=None, xticksrotation=None,
                      yticks=None, yticklabels=None, yticksrotation=None,
@@ -0,0 +1,67 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: culled annotations follow the size of the
+#               figure when it is drawn
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import io
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotAnnotations
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def _layer(n=2000):
+    rng = np.random.default_rng(0)
+    x, y = rng.random(n), rng.random(n)
+    fig = Figure(figsize=(3, 2))
+    ax = fig.add_subplot()
+    ax.scatter(x, y)
+    return fig, plotAnnotations.AnnotationLayer(
+        ax, [("P" + str(i), (x[i], y[i])) for i in range(n)], cull=True)
+
+
+def test_cullOnResize():
+    fig, layer = _layer()
+    small = len(layer.shown())
+
+    # Culled again w/ the new size when the figure is saved
+    fig.set_size_inches(12, 8)
+    fig.savefig(io.BytesIO(), format='png')
+    large = len(layer.shown())
+    assert large > 2 * small
+
+    fig.set_size_inches(3, 2)
+    fig.savefig(io.BytesIO(), format='png')
+    assert len(layer.shown()) == small
+
+
+def test_cullOnTightLayout():
+    fig, layer = _layer()
+    before = layer.ax.bbox.bounds
+    fig.tight_layout()
+    fig.savefig(io.BytesIO(), format='png')
+
+    assert layer.ax.bbox.bounds != before
+    assert layer.last[1] == tuple(layer.ax.bbox.bounds)
+
+
+def test_disconnect():
+    fig, layer = _layer(10)
+    layer.disconnect()
+    assert fig.artists == []
@@ -0,0 +1,119 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: figures created by the plotters are freed
+#               and the memory of the process stays bounded
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests, incl. thousands of figures per
+#               plotter: python -m pytest tests -m slow
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import gc
+import os
+import sys
+import weakref
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters.plot1D import plot1D
+from pyLEK.plotters.plot2D import plot2D
+from pyLEK.plotters.plot3D_surf import plot3D_surf
+from pyLEK.plotters.plot3D_trisurf import plot3D_trisurf
+from pyLEK.plotters.plot4D_surf import plot4D_surf
+from pyLEK.plotters.plotBarChart import plotBarChart
+from pyLEK.plotters.plotPieChart import plotPieChart
+from pyLEK.plotters.plotScatter import plotScatter
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+# Figures checked to be freed per plotter and path
+n = 5
+
+# Figures rendered per plotter in the slow test, after warming up
+nSlow = 1000
+
+# Allowed growth of the resident memory per figure, a leaked figure holds
+# about 250 kB
+maxGrowthKB = 25
+
+_x = np.linspace(0, 1, 50)
+_X, _Y = np.meshgrid(np.linspace(0, 1, 20), np.linspace(0, 1, 20))
+_rng = np.random.default_rng(0)
+_px, _py = _rng.random(100), _rng.random(100)
+
+plotters = {
+    "plot1D": lambda **kw: plot1D(_x, **kw),
+    "plot2D": lambda **kw: plot2D(_x, np.sin(_x), **kw),
+    "plotScatter": lambda **kw: plotScatter(_px, _py, mpl='_2D', **kw),
+    "plotBarChart": lambda **kw: plotBarChart([[1, 2, 3], [3, 2, 1]], **kw),
+    "plotPieChart": lambda **kw: plotPieChart([[1, 2], [3, 4]], **kw),
+    "plot3D_surf": lambda **kw: plot3D_surf(_X, _Y, _X * _Y, **kw),
+    "plot4D_surf": lambda **kw: plot4D_surf(_X, _Y, _X * _Y, _X + _Y, **kw),
+    "plot3D_trisurf": lambda **kw: plot3D_trisurf(_px, _py, _px * _py, **kw),
+}
+
+
+def _rss():
+    # Resident memory of this process in MB
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, AttributeError):
+        import resource
+        # Peak instead of current memory, bytes on macOS / kB on linux
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024**2 if sys.platform == 'darwin' else rss / 1024
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("save", [False, True], ids=["noSave", "save"])
+@pytest.mark.parametrize("name", list(plotters))
+def test_figuresFreed(name, save, tmp_path):
+    plotter = plotters[name]
+    kwargs = {"dir_fileName": str(tmp_path / name), "savePlt": True} if save else {}
+
+    # The plotters return the figure, no other reference must be left
+    refs = []
+    for i in range(n):
+        fig, ax = plotter(**kwargs)
+        refs.append(weakref.ref(fig))
+    del fig, ax
+    gc.collect()
+
+    assert plt.get_fignums() == [], "Figures created by " + name + " were not closed"
+    alive = sum(ref() is not None for ref in refs)
+    assert alive == 0, str(alive) + " figures created by " + name + " were not freed"
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", list(plotters))
+def test_memoryBounded(name):
+    plotter = plotters[name]
+
+    # Warm up caches (styles, fonts, text layout)
+    for i in range(10):
+        plotter()
+    gc.collect()
+
+    start = _rss()
+    for i in range(nSlow):
+        plotter()
+    gc.collect()
+    growth = (_rss() - start) * 1024 / nSlow
+
+    assert growth < maxGrowthKB, ("Memory grows by {:.0f} kB per figure w/ {}"
+                                  .format(growth, name))
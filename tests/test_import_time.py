@@ -0,0 +1,24 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: importing pyLEK does not load the heavy
+#               dependencies and stays fast
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Imported functions
+# ------------------------------------------------------------------------------
+
+from pyLEK.helpers import importTime
+
+# ------------------------------------------------------------------------------
+# Tests / Example
+# ------------------------------------------------------------------------------
+
+# Tolerant, matplotlib alone takes about 0.3 s on a cold machine
+maxSeconds = 5.0
+
+
+def test_checkImports():
+    results = importTime.checkImports(maxSeconds=maxSeconds, repeat=1)
+    assert set(results) == set(importTime.guardedModules)
@@ -0,0 +1,49 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: a LineCollection of plot2D is styled by the
+#               cycler as the single lines it replaces
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from cycler import cycler
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotData
+from pyLEK.plotters.plot2D import plot2D
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+_x = np.linspace(0, 1, 20)
+_y = np.array([_x + i for i in range(4)])
+
+
+def test_collectionMatchesLines():
+    customCycler = (cycler(color=['r', 'b']) + cycler(linewidth=[0.5, 2.0]) +
+                    cycler(alpha=[0.3, 1.0]) + cycler(linestyle=['-', '--']))
+
+    fig, ax = plot2D(_x, _y, customCycler=customCycler)
+    lines = ax.get_lines()
+    fig, ax = plot2D(_x, _y, customCycler=customCycler, collection=True)
+    lc = ax.collections[0]
+
+    expected = [matplotlib.colors.to_rgba(l.get_color(), l.get_alpha()) for l in lines]
+    np.testing.assert_allclose(lc.get_colors(), expected)
+    np.testing.assert_allclose(lc.get_linewidths(), [l.get_linewidth() for l in lines])
+    assert len(lc.get_linestyles()) == len(lines)
+
+
+def test_cyclerStyles_aliases():
+    styles = plotData.cyclerStyles(cycler(c=['k']) + cycler(lw=[3.0]), 2)
+    np.testing.assert_allclose(styles["colors"], [[0, 0, 0, 1]] * 2)
+    np.testing.assert_allclose(styles["linewidths"], [3.0, 3.0])
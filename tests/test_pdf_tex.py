@@ -0,0 +1,47 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: the .pdf_tex written w/o Inkscape passes the
+#               texts to LaTeX as Inkscape does
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotHelpers
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def test_latexText():
+    assert plotHelpers._latexText(r"\$\sin x\$") == r"$\sin x$"
+    assert plotHelpers._latexText(r"\$\frac{\pi}{2}\$ in \%") == r"$\frac{\pi}{2}$ in \%"
+    assert plotHelpers._latexText("−1") == "-1"
+
+
+def test_savePdf_texNative_mathLabel(tmp_path):
+    fig = Figure()
+    ax = fig.add_subplot()
+    ax.plot([0, 1], [0, 1], label=r"\$\sin x + \frac{\pi}{2}\$")
+    ax.legend()
+    ax.set_xlabel(r"Time \$t\$ [s]")
+
+    dir_fileName = str(tmp_path / "fig")
+    plotHelpers.savePdf_texNative(fig, dir_fileName)
+
+    with open(dir_fileName + ".pdf_tex", encoding="utf-8") as file:
+        puts = [line for line in file if line.lstrip().startswith(r"\put") and "tabular" in line]
+
+    assert any(r"}$\sin x + \frac{\pi}{2}$\end{tabular}" in put for put in puts)
+    assert any(r"}Time $t$ [s]\end{tabular}" in put for put in puts)
+    assert not any(r"\$" in put for put in puts)
@@ -0,0 +1,64 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: the Inkscape shells of the PdfTexExporter are
+#               cleaned up and exporters are active per thread
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import os
+import subprocess
+import threading
+
+import pytest
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotHelpers
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="fake Inkscape is a shell script")
+def test_shellKilledOnTimeout(tmp_path, monkeypatch):
+    # Stands in for an Inkscape which never shows its prompt
+    inkscape = tmp_path / "inkscape"
+    inkscape.write_text("#!/bin/sh\nsleep 60\n")
+    inkscape.chmod(0o755)
+
+    processes = []
+    Popen = subprocess.Popen
+
+    def popen(*args, **kwargs):
+        processes.append(Popen(*args, **kwargs))
+        return processes[-1]
+
+    monkeypatch.setattr(plotHelpers.subprocess, "Popen", popen)
+
+    with pytest.raises(TimeoutError):
+        plotHelpers._InkscapeShell(str(inkscape), timeout=0.5)
+
+    assert len(processes) == 1
+    assert processes[0].poll() is not None
+
+
+def test_exporterPerThread():
+    found = []
+
+    def otherThread():
+        found.append(plotHelpers._activeExporter())
+
+    with plotHelpers.PdfTexExporter(workers=1) as exporter:
+        assert plotHelpers._activeExporter() is exporter
+        thread = threading.Thread(target=otherThread)
+        thread.start()
+        thread.join()
+
+    assert found == [None]
+    assert plotHelpers._activeExporter() is None
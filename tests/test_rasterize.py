@@ -0,0 +1,53 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: dense artists are rasterized and counted
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotHelpers
+from pyLEK.plotters.plot2D import plot2D
+from pyLEK.plotters.plotScatter import plotScatter
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+_dense = np.linspace(0, 1, 10000)
+_sparse = np.linspace(0, 1, 100)
+
+
+def test_plot2D_rasterizedArtists():
+    fig, ax = plot2D(_dense, [np.sin(_dense), np.cos(_dense)], rasterize=True)
+    assert fig.rasterizedArtists == 2
+    assert all(line.get_rasterized() for line in ax.get_lines())
+
+    fig, ax = plot2D(_dense, np.sin(_dense), rasterize=20000)
+    assert fig.rasterizedArtists == 0
+
+    fig, ax = plot2D(_sparse, np.sin(_sparse))
+    assert not hasattr(fig, 'rasterizedArtists')
+
+
+def test_plotScatter_rasterizedArtists():
+    rng = np.random.default_rng(0)
+    fig, ax = plotScatter(rng.random(6000), rng.random(6000), mpl='_2D', rasterize=True)
+    assert fig.rasterizedArtists == 1
+
+
+def test_rasterizeDense_count():
+    fig, ax = plotHelpers.newFigure()
+    ax.plot(_dense, _dense)
+    ax.plot(_sparse, _sparse)
+    assert plotHelpers.rasterizeDense(fig) == 1
+    assert plotHelpers.rasterizeDense(fig, 50) == 2
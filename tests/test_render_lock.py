@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: slow jobs of the plotters (Inkscape export)
+#               run w/o holding renderLock
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import shutil
+import threading
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import plotHelpers
+from pyLEK.plotters.plot2D import plot2D
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+def _lockFree():
+    # renderLock can be taken by another thread
+    free = []
+
+    def acquire():
+        if plotHelpers.renderLock.acquire(timeout=0):
+            free.append(True)
+            plotHelpers.renderLock.release()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    thread.join()
+    return bool(free)
+
+
+def test_inkscapeWithoutRenderLock(tmp_path, monkeypatch):
+    calls = []
+
+    def inkscape(incmd):
+        # Stands in for Inkscape, writes the .pdf + .pdf_tex
+        calls.append(_lockFree())
+        dir_fileName = str(tmp_path / "fig")
+        shutil.copy(incmd[1], dir_fileName + ".pdf")
+        open(dir_fileName + ".pdf_tex", "w").close()
+        return b""
+
+    monkeypatch.setattr(plotHelpers, "_inkscapeFound", True)
+    monkeypatch.setattr(plotHelpers.subprocess, "check_output", inkscape)
+
+    x = np.linspace(0, 1, 10)
+    plot2D(x, x, dir_fileName=str(tmp_path / "fig"), saveTex=True)
+
+    assert calls == [True]
+    assert (tmp_path / "fig.pdf_tex").exists()
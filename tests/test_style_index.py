@@ -0,0 +1,72 @@
+# ------------------------------------------------------------------------------
+# Description:  Regression test: the index of .mplstyle-sheets finds sheets
+#               added to nested folders w/o clearing it
+# Author:       benedikt.strahm@ilek.uni-stuttgart.de
+# Created:      2026-10-18
+# Execution:    python -m pytest tests
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# Libraries
+# ------------------------------------------------------------------------------
+import os
+import shutil
+
+import pytest
+
+# ----------------------------------------------------------------------
+# Imported functions
+# ----------------------------------------------------------------------
+
+from pyLEK.plotters import renderCache
+from pyLEK.plotters.plotStyle import mplStyle
+
+# ----------------------------------------------------------------------
+# Tests / Example
+# ----------------------------------------------------------------------
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    # Two project folders, the first one w/ higher priority
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.setenv("PYLEK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(mplStyle, "_searchRoots",
+                        lambda: [(str(first), 'custom'), (str(second), 'PYTHONPATH')])
+    mplStyle.clearStyleIndex()
+    yield first, second
+    mplStyle.clearStyleIndex()
+
+
+def _addSheet(folder, mpl):
+    os.makedirs(folder, exist_ok=True)
+    source = os.path.join(os.path.dirname(mplStyle.__file__), '_2D.mplstyle')
+    shutil.copy(source, os.path.join(folder, mpl + '.mplstyle'))
+
+
+def test_nestedSheetFound(roots):
+    first, second = roots
+    _addSheet(second, '_custom')
+    assert mplStyle.lookupPlotStyle('_custom') == (str(second / '_custom'), 'PYTHONPATH')
+
+    # Sheet w/ higher priority in a nested folder, the index is outdated
+    _addSheet(first / 'a' / 'b', '_custom')
+    assert mplStyle.lookupPlotStyle('_custom') == (str(first / 'a' / 'b' / '_custom'), 'custom')
+
+    # Removed again
+    os.remove(first / 'a' / 'b' / '_custom.mplstyle')
+    assert mplStyle.lookupPlotStyle('_custom')[0] == str(second / '_custom')
+
+
+def test_styleHashSilent(roots, capsys):
+    first, second = roots
+    _addSheet(first, '_custom')
+    capsys.readouterr()
+
+    renderCache._styleHash('_custom')
+    assert capsys.readouterr().out == ""
+
+    mplStyle.findPlotStyle('_custom')
+    assert capsys.readouterr().out.count(".mplstyle") == 1